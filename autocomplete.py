@@ -0,0 +1,123 @@
+import bisect
+
+class PrefixIndex:
+    """
+    Case-insensitive prefix search over named items, kept as sorted key arrays
+    so lookups are a binary search and adds are a single sorted insert.
+    Whole names are matched first, then the start of any later word in the
+    name ("crypt" finds "CPSC 352 - Cryptography").
+    """
+
+    def __init__(self, entries=()):
+        self._name_keys, self._name_items = [], []
+        self._word_keys, self._word_items = [], []
+        self.update(entries)
+
+    def __len__(self):
+        return len(self._name_items)
+
+    @staticmethod
+    def _insert(keys, items, key, item):
+        position = bisect.bisect_right(keys, key)
+        keys.insert(position, key)
+        items.insert(position, item)
+
+    def add(self, name, item):
+        key = name.lower()
+        self._insert(self._name_keys, self._name_items, key, item)
+        words = key.split()
+        for i in range(1, len(words)):
+            if words[i][0].isalnum():
+                self._insert(self._word_keys, self._word_items, " ".join(words[i:]), item)
+
+    @staticmethod
+    def _discard(keys, items, key, item):
+        i = bisect.bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key:
+            if items[i] == item:
+                del keys[i], items[i]
+                return
+            i += 1
+
+    def remove(self, name, item):
+        """Undo add(name, item)."""
+        key = name.lower()
+        self._discard(self._name_keys, self._name_items, key, item)
+        words = key.split()
+        for i in range(1, len(words)):
+            if words[i][0].isalnum():
+                self._discard(self._word_keys, self._word_items, " ".join(words[i:]), item)
+
+    def update(self, entries):
+        for name, item in entries:
+            self.add(name, item)
+
+    @staticmethod
+    def _scan(keys, items, prefix, limit, found, results):
+        i = bisect.bisect_left(keys, prefix)
+        while i < len(keys) and len(results) < limit and keys[i].startswith(prefix):
+            if id(items[i]) not in found:
+                found.add(id(items[i]))
+                results.append(items[i])
+            i += 1
+
+    def complete(self, prefix, limit=50):
+        """Up to limit items whose name or a later word starts with prefix, in name order."""
+        prefix = " ".join(prefix.lower().split())
+        found, results = set(), []
+        self._scan(self._name_keys, self._name_items, prefix, limit, found, results)
+        if prefix:
+            self._scan(self._word_keys, self._word_items, prefix, limit, found, results)
+        return results
+
+class ComboboxAutocomplete:
+    """
+    Filter a ttk.Combobox's dropdown through a PrefixIndex as the user types.
+    Keystrokes are debounced with root.after(), and only the top `limit`
+    matches are formatted into display strings. selected() maps the chosen
+    display string back to its item.
+    """
+
+    # Keys that move through the dropdown rather than edit the text
+    NAVIGATION_KEYS = {'Up', 'Down', 'Left', 'Right', 'Return', 'Escape', 'Tab', 'Home', 'End'}
+
+    def __init__(self, combobox, index, format=str, limit=50, debounce_ms=150):
+        self.combobox = combobox
+        self.index = index
+        self.format = format
+        self.limit = limit
+        self.debounce_ms = debounce_ms
+        self.shown = {}  # display string -> item for the current suggestions
+        self._after_id = None
+
+        combobox.configure(postcommand=self._on_post)
+        combobox.bind('<KeyRelease>', self._on_key, add='+')
+        self.refresh()
+
+    def refresh(self):
+        """Re-filter now, e.g. after items were added to the index."""
+        if self._after_id is not None:
+            self.combobox.after_cancel(self._after_id)
+            self._after_id = None
+        text = self.combobox.get()
+        # Keep the list as-is while the text is a suggestion the user picked
+        if text and text in self.shown:
+            return
+        matches = self.index.complete(text, self.limit)
+        self.shown = {self.format(item): item for item in matches}
+        self.combobox['values'] = list(self.shown)
+
+    def selected(self):
+        """The item behind the combobox text, or None if it is not a suggestion."""
+        return self.shown.get(self.combobox.get())
+
+    def _on_key(self, event):
+        if event.keysym in self.NAVIGATION_KEYS:
+            return
+        if self._after_id is not None:
+            self.combobox.after_cancel(self._after_id)
+        self._after_id = self.combobox.after(self.debounce_ms, self.refresh)
+
+    def _on_post(self):
+        # Opening the dropdown should never show a stale list
+        self.refresh()
@@ -0,0 +1,61 @@
+import queue
+import threading
+
+class BackgroundWorker:
+    """
+    Run func(worker) on a daemon thread and deliver the outcome on the Tk thread.
+    The Tk side polls with root.after(), so widgets are only touched from the
+    mainloop. func can read worker.cancel_event and call worker.report_progress().
+    """
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, root, func, on_done, on_error=None, on_cancel=None, on_progress=None):
+        self.root = root
+        self.func = func
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.on_progress = on_progress
+        self.cancel_event = threading.Event()
+        self.running = True
+        self._results = queue.Queue()
+        self._progress = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.root.after(self.POLL_INTERVAL_MS, self._poll)
+
+    def report_progress(self, fraction):
+        # Only the latest value matters, so a plain attribute is enough
+        self._progress = fraction
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _run(self):
+        try:
+            result = self.func(self)
+        except Exception as e:
+            self._results.put(('cancelled' if self.cancel_event.is_set() else 'error', e))
+        else:
+            self._results.put(('done', result))
+
+    def _poll(self):
+        if self.on_progress and self._progress is not None:
+            self.on_progress(self._progress)
+
+        try:
+            kind, value = self._results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.POLL_INTERVAL_MS, self._poll)
+            return
+
+        self.running = False
+        if kind == 'done':
+            self.on_done(value)
+        elif kind == 'cancelled':
+            if self.on_cancel:
+                self.on_cancel()
+        elif self.on_error:
+            self.on_error(value)
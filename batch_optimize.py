@@ -0,0 +1,133 @@
+import argparse
+import itertools
+import json
+import os
+from multiprocessing import Pool
+from data_loader import get_data
+from graph_builder import build_csuf_graph
+from solution_cache import SolutionCache, cached_optimize_route
+
+# Per-process state, loaded once by _init_worker
+_G = None
+_weekly_schedule = None
+_solution_cache = None
+
+def load_weekly_schedule(weekly_path=None):
+    # The data layer's weekly schedule, or the one in a specific weekly_tasks.json
+    if weekly_path is None:
+        return get_data().weekly_schedule
+    with open(weekly_path, 'r') as f:
+        return json.load(f)['weekly_schedule']
+
+def _init_worker(weekly_path, cache_dir=None):
+    global _G, _weekly_schedule, _solution_cache
+    _G, _ = build_csuf_graph()
+    _solution_cache = SolutionCache(disk_dir=cache_dir)
+    _weekly_schedule = load_weekly_schedule(weekly_path)
+
+def solve_request(item):
+    """
+    Solve one schedule request. A request holds either "tasks" (a list of task
+    dicts) or "day" (a day of the weekly schedule). Never raises: failures are
+    reported in the result's "error" field so the output stays in step with the input.
+    """
+    line_no, line = item
+    result = {"line": line_no, "request_id": line_no}
+    try:
+        request = json.loads(line)
+        result["request_id"] = request.get("request_id", request.get("id", line_no))
+
+        if "tasks" in request:
+            tasks = request["tasks"]
+        elif "day" in request:
+            if request["day"] not in _weekly_schedule:
+                raise ValueError(f"Unknown day '{request['day']}'")
+            tasks = _weekly_schedule[request["day"]]
+        else:
+            raise ValueError("Request needs 'tasks' or 'day'")
+
+        # Skip tasks whose building is not on the campus graph, like load_day_tasks()
+        skipped = [t['task_name'] for t in tasks if t['building_name'] not in _G]
+        tasks = [t for t in tasks if t['building_name'] in _G]
+
+        schedule, route, total_distance = cached_optimize_route(_solution_cache, _G, tasks)
+        result.update(schedule=schedule, route=route, total_distance=total_distance, skipped=skipped)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+def completed_results(output_path):
+    """
+    Count the complete result lines already written, truncating a partial last
+    line left by a crash. Results are written in input order, so this is also
+    the number of input requests to skip when resuming.
+    """
+    if not os.path.exists(output_path):
+        return 0
+    count = 0
+    valid_bytes = 0
+    with open(output_path, 'rb') as f:
+        for raw in f:
+            try:
+                json.loads(raw)
+            except ValueError:
+                break
+            if not raw.endswith(b'\n'):
+                break
+            count += 1
+            valid_bytes += len(raw)
+    with open(output_path, 'r+b') as f:
+        f.truncate(valid_bytes)
+    return count
+
+def iter_requests(input_path, skip=0):
+    # Stream (line number, line) for every non-empty input line
+    with open(input_path, 'r') as f:
+        numbered = ((line_no, line) for line_no, line in enumerate(f, 1) if line.strip())
+        yield from itertools.islice(numbered, skip, None)
+
+def run_batch(input_path, output_path, weekly_path=None, workers=None, window=256, cache_dir=None):
+    """
+    Solve every request in input_path with a process pool and append results to
+    output_path in input order, resuming after the last complete result.
+    Input is read in windows so memory stays bounded for very large files.
+    With cache_dir, identical task sets are solved once and shared by all workers.
+    weekly_path defaults to the weekly_tasks.json next to the code.
+    """
+    # A worker initializer that raises makes Pool respawn workers forever, so
+    # check the weekly schedule loads here first and fail fast if it does not
+    load_weekly_schedule(weekly_path)
+
+    done = completed_results(output_path)
+    requests = iter_requests(input_path, skip=done)
+    solved = 0
+
+    with Pool(workers, initializer=_init_worker, initargs=(weekly_path, cache_dir)) as pool, \
+            open(output_path, 'a') as out:
+        while True:
+            batch = list(itertools.islice(requests, window))
+            if not batch:
+                break
+            for result in pool.imap(solve_request, batch, chunksize=4):
+                out.write(json.dumps(result) + '\n')
+                solved += 1
+            # Make finished windows durable before moving on
+            out.flush()
+            os.fsync(out.fileno())
+
+    return done, solved
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch schedule optimization over a JSONL file")
+    parser.add_argument("input", nargs="?", default="requests.jsonl")
+    parser.add_argument("output", nargs="?", default="results.jsonl")
+    parser.add_argument("--weekly", help="weekly schedule JSON (default: the weekly_tasks.json next to this script)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-dir", help="persist solutions here and reuse them across workers and runs")
+    args = parser.parse_args()
+
+    try:
+        skipped, solved = run_batch(args.input, args.output, args.weekly, args.workers, cache_dir=args.cache_dir)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+    print(f"Resumed after {skipped} results, solved {solved} requests -> {args.output}")
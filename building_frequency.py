@@ -1,32 +1,138 @@
+import argparse
+import csv
 import json
-import matplotlib.pyplot as plt
+import sys
 from collections import Counter
+from data_loader import get_data
+from json_stream import iter_json_arrays, iter_jsonl
 
-# Load data from files
-with open("csuf_locations.json", "r") as f:
-    csuf_locations = json.load(f)
-
-with open("tasks.json", "r") as f:
-    tasks_data = json.load(f)
-
-# Count how often each building is used in tasks.json
-task_buildings = [task["building_name"] for task in tasks_data["tasks"]]
-building_counts = Counter(task_buildings)
-
-# Ensure all csuf_locations buildings are represented, even if unused
-for building in csuf_locations:
-    if building not in building_counts:
-        building_counts[building] = 0
-
-# Sort buildings alphabetically (or use sorted by frequency with .most_common())
-sorted_buildings = dict(sorted(building_counts.items()))
-
-# Plot the data
-plt.figure(figsize=(14, 7))
-plt.bar(sorted_buildings.keys(), sorted_buildings.values(), color="skyblue")
-plt.xticks(rotation=90)
-plt.xlabel("Building")
-plt.ylabel("Task Frequency")
-plt.title("Frequency of Tasks per Building (CSUF)")
-plt.tight_layout()
-plt.show()
+# Key paths holding task lists: tasks.json, weekly_tasks.json or a bare list
+TASK_PATHS = [('tasks',), ('weekly_schedule', '*'), ()]
+
+def iter_tasks(path):
+    """
+    Stream (day, task) pairs from a task log without loading it into memory.
+    Supports tasks.json, weekly_tasks.json, a bare JSON list and JSONL files.
+    The day is taken from the weekly schedule key or a task's "day" field.
+    """
+    with open(path, 'r') as f:
+        if path.endswith('.jsonl'):
+            for task in iter_jsonl(f):
+                yield task.get('day'), task
+        else:
+            for keys, task in iter_json_arrays(f, TASK_PATHS):
+                day = keys[1] if keys and keys[0] == 'weekly_schedule' else task.get('day')
+                yield day, task
+
+class BuildingFrequency:
+    """
+    Incremental building/day/hour occupancy counts. Memory is bounded by the
+    number of distinct buildings and days, not by the number of tasks seen.
+    """
+
+    def __init__(self, buildings=()):
+        # Ensure all known buildings are represented, even if unused
+        self.building_counts = Counter({building: 0 for building in buildings})
+        self.day_counts = Counter()
+        self.hour_counts = Counter()
+        self.building_hour_counts = Counter()
+        self.num_tasks = 0
+
+    def add(self, task, day=None):
+        building = task['building_name']
+        self.building_counts[building] += 1
+        if day:
+            self.day_counts[day] += 1
+
+        # Count every hour the task occupies
+        start_h, start_m = map(int, task['time_start'].split(':'))
+        end_h, end_m = map(int, task['time_finish'].split(':'))
+        start = start_h * 60 + start_m
+        end = end_h * 60 + end_m
+        for hour in range(start // 60, (end - 1) // 60 + 1):
+            self.hour_counts[hour] += 1
+            self.building_hour_counts[(building, hour)] += 1
+
+        self.num_tasks += 1
+
+    def update(self, day_tasks):
+        for day, task in day_tasks:
+            self.add(task, day)
+
+    def to_dict(self):
+        return {
+            "num_tasks": self.num_tasks,
+            "buildings": dict(sorted(self.building_counts.items())),
+            "days": dict(self.day_counts),
+            "hours": {f"{hour:02d}:00": count for hour, count in sorted(self.hour_counts.items())},
+            "building_hours": {
+                f"{building}|{hour:02d}:00": count
+                for (building, hour), count in sorted(self.building_hour_counts.items())
+            },
+        }
+
+    def write_json(self, f):
+        json.dump(self.to_dict(), f, indent=2)
+
+    def write_csv(self, f):
+        writer = csv.writer(f)
+        writer.writerow(["dimension", "key", "hour", "count"])
+        for building, count in sorted(self.building_counts.items()):
+            writer.writerow(["building", building, "", count])
+        for day, count in self.day_counts.items():
+            writer.writerow(["day", day, "", count])
+        for hour, count in sorted(self.hour_counts.items()):
+            writer.writerow(["hour", "", f"{hour:02d}:00", count])
+        for (building, hour), count in sorted(self.building_hour_counts.items()):
+            writer.writerow(["building_hour", building, f"{hour:02d}:00", count])
+
+    def save_png(self, path):
+        # Render off-screen with a standalone Agg canvas, leaving pyplot's backend alone
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        sorted_buildings = dict(sorted(self.building_counts.items()))
+
+        fig = Figure(figsize=(14, 7))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.bar(list(sorted_buildings.keys()), list(sorted_buildings.values()), color="skyblue")
+        ax.tick_params(axis='x', labelrotation=90)
+        ax.set_xlabel("Building")
+        ax.set_ylabel("Task Frequency")
+        ax.set_title("Frequency of Tasks per Building (CSUF)")
+        fig.tight_layout()
+        fig.savefig(path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Building frequency analytics over task logs")
+    parser.add_argument("inputs", nargs="*", default=["tasks.json"],
+                        help="task files (.json, .jsonl or weekly_tasks.json)")
+    parser.add_argument("--locations", help="locations JSON (default: the shared campus data)")
+    parser.add_argument("--json", dest="json_out", help="write counts as JSON ('-' for stdout)")
+    parser.add_argument("--csv", dest="csv_out", help="write counts as CSV ('-' for stdout)")
+    parser.add_argument("--png", dest="png_out", help="write a bar chart PNG")
+    args = parser.parse_args()
+
+    if args.locations:
+        with open(args.locations, "r") as f:
+            csuf_locations = json.load(f)
+    else:
+        csuf_locations = get_data().locations
+
+    frequency = BuildingFrequency(csuf_locations)
+    for path in args.inputs:
+        frequency.update(iter_tasks(path))
+
+    if not (args.json_out or args.csv_out or args.png_out):
+        args.json_out = "-"
+
+    for out, write in ((args.json_out, frequency.write_json), (args.csv_out, frequency.write_csv)):
+        if out == "-":
+            write(sys.stdout)
+        elif out:
+            with open(out, "w", newline="") as f:
+                write(f)
+
+    if args.png_out:
+        frequency.save_png(args.png_out)
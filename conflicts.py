@@ -0,0 +1,110 @@
+import numpy as np
+import networkx as nx
+from data_loader import get_data
+
+# Convert an "HH:MM" string to minutes after midnight
+def time_to_minutes(time_str):
+    hours, minutes = time_str.split(':')
+    return int(hours) * 60 + int(minutes)
+
+# Load the start and end times of a list of tasks into integer minute arrays
+def task_time_arrays(tasks):
+    starts = np.fromiter((time_to_minutes(t['time_start']) for t in tasks), dtype=np.int32, count=len(tasks))
+    ends = np.fromiter((time_to_minutes(t['time_finish']) for t in tasks), dtype=np.int32, count=len(tasks))
+    return starts, ends
+
+def find_conflicting_pairs(starts, ends):
+    """
+    Find every pair of overlapping intervals with a sort-and-sweep.
+    Uses the same rule as tasks_overlap() in main.py: two tasks conflict when
+    each one starts before the other ends. Returns two index arrays (i, j)
+    with i < j into the original task order.
+    """
+    starts = np.asarray(starts)
+    ends = np.asarray(ends)
+    n = len(starts)
+    if n < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    # Sort by start time so the candidates for each task are a contiguous run
+    order = np.argsort(starts, kind='stable')
+    s = starts[order]
+    e = ends[order]
+
+    # Every task after position k that starts before task k ends is a candidate
+    upper = np.searchsorted(s, e, side='left')
+    counts = np.clip(upper - np.arange(n) - 1, 0, None)
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    # Expand the runs into flat (k, m) position pairs without a Python loop
+    left = np.repeat(np.arange(n), counts)
+    run_starts = np.cumsum(counts) - counts
+    right = left + 1 + (np.arange(total) - np.repeat(run_starts, counts))
+
+    # Drop candidates that end before the earlier task starts (zero-length tasks)
+    keep = e[right] > s[left]
+    a = order[left[keep]]
+    b = order[right[keep]]
+    return np.minimum(a, b), np.maximum(a, b)
+
+# Peak number of tasks running at the same time
+def peak_concurrency(starts, ends):
+    if len(starts) == 0:
+        return 0
+    times = np.concatenate([starts, ends])
+    # Ends sort before starts at the same minute, matching tasks_overlap()
+    deltas = np.concatenate([np.ones(len(starts), dtype=np.int32), -np.ones(len(ends), dtype=np.int32)])
+    order = np.lexsort((deltas, times))
+    return int(np.cumsum(deltas[order]).max())
+
+def analyze_conflicts(tasks):
+    """
+    Build a conflict graph for a list of tasks and compute summary statistics.
+    Nodes are task indices carrying the task dict; edges carry the overlap in minutes.
+    """
+    starts, ends = task_time_arrays(tasks)
+    i, j = find_conflicting_pairs(starts, ends)
+    overlap = np.minimum(ends[i], ends[j]) - np.maximum(starts[i], starts[j])
+
+    conflict_graph = nx.Graph()
+    for index, task in enumerate(tasks):
+        conflict_graph.add_node(index, task=task)
+    conflict_graph.add_weighted_edges_from(
+        zip(i.tolist(), j.tolist(), overlap.tolist()), weight='overlap_minutes'
+    )
+
+    degrees = np.bincount(np.concatenate([i, j]), minlength=len(tasks))
+    stats = {
+        "num_tasks": len(tasks),
+        "num_conflicts": int(len(i)),
+        "conflicting_tasks": int(np.count_nonzero(degrees)),
+        "max_conflicts_per_task": int(degrees.max()) if len(tasks) else 0,
+        "total_overlap_minutes": int(overlap.sum()),
+        "peak_concurrency": peak_concurrency(starts, ends),
+    }
+    return conflict_graph, stats
+
+def conflict_report(tasks_list, weekly_schedule):
+    """
+    Run analyze_conflicts() over the task catalog and every day of the weekly
+    schedule. Returns a dict mapping "catalog" and each day name to (graph, stats).
+    """
+    report = {"catalog": analyze_conflicts(tasks_list)}
+    for day, day_tasks in weekly_schedule.items():
+        report[day] = analyze_conflicts(day_tasks)
+    return report
+
+if __name__ == "__main__":
+    data = get_data()
+    report = conflict_report(data.tasks, data.weekly_schedule)
+    for name, (conflict_graph, stats) in report.items():
+        print(f"{name}: {stats['num_conflicts']} conflicts among {stats['num_tasks']} tasks "
+              f"(peak concurrency {stats['peak_concurrency']}, {stats['total_overlap_minutes']} overlapping minutes)")
+        for u, v, minutes in conflict_graph.edges(data='overlap_minutes'):
+            task1 = conflict_graph.nodes[u]['task']
+            task2 = conflict_graph.nodes[v]['task']
+            print(f"  {task1['task_name']} <-> {task2['task_name']} ({minutes} min)")
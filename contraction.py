@@ -0,0 +1,287 @@
+import argparse
+import heapq
+import json
+import os
+import time
+import numpy as np
+from csr_graph import CSRGraph
+from graph_utils import graph_fingerprint
+
+# Arrays making up a saved hierarchy, each stored as <name>.npy
+HIERARCHY_ARRAYS = (
+    "nodes",       # [n]    node names (or OSM node ids)
+    "rank",        # int32 [n]    contraction order, higher is more important
+    "up_offsets",  # int64 [n+1]  CSR offsets into the upward edges per node
+    "up_targets",  # int32 [m]    higher-ranked neighbour
+    "up_weights",  # float64 [m]  edge or shortcut length in meters
+    "up_middle",   # int32 [m]    node a shortcut bypasses, -1 for an original edge
+)
+
+# Witness searches give up after settling this many nodes; that only adds shortcuts, never wrong ones
+WITNESS_SETTLE_LIMIT = 64
+
+def _witness_distance(adj, source, target_set, excluded, cutoff):
+    """Shortest distances from source to target_set without passing through excluded."""
+    dist = {source: 0.0}
+    found = {}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap and settled < WITNESS_SETTLE_LIMIT and len(found) < len(target_set):
+        d, u = heapq.heappop(heap)
+        if d > dist[u] or d > cutoff:
+            if d > cutoff:
+                break
+            continue
+        settled += 1
+        if u in target_set:
+            found[u] = d
+        for v, (w, _) in adj[u].items():
+            nd = d + w
+            if v != excluded and nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return found
+
+def _shortcuts(adj, u):
+    """Shortcuts (v, w, length) needed to keep distances exact if u is removed."""
+    neighbors = list(adj[u].items())
+    needed = []
+    for i, (v, (w_v, _)) in enumerate(neighbors):
+        targets = {w: w_v + w_w for w, (w_w, _) in neighbors[i + 1:]}
+        if not targets:
+            continue
+        witnesses = _witness_distance(adj, v, targets, u, max(targets.values()))
+        for w, via_u in targets.items():
+            if witnesses.get(w, float('inf')) > via_u:
+                needed.append((v, w, via_u))
+    return needed
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over an undirected weighted graph. Every edge and
+    shortcut is stored once, at its lower-ranked end, so a query is two
+    upward Dijkstra searches (one from each end) that meet at the top.
+    Shortcuts remember the node they bypass, so paths unpack to real nodes.
+    """
+
+    def __init__(self, nodes, rank, up_offsets, up_targets, up_weights, up_middle):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.rank = np.asarray(rank, dtype=np.int32)
+        self.up_offsets = np.asarray(up_offsets, dtype=np.int64)
+        self.up_targets = np.asarray(up_targets, dtype=np.int32)
+        self.up_weights = np.asarray(up_weights, dtype=np.float64)
+        self.up_middle = np.asarray(up_middle, dtype=np.int32)
+        # Plain lists are much faster than array indexing inside the Python search loop
+        self._offsets = self.up_offsets.tolist()
+        self._targets = self.up_targets.tolist()
+        self._weights = self.up_weights.tolist()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    @classmethod
+    def build(cls, nodes, offsets, neighbors, weights):
+        """
+        Contract every node of a CSR graph in order of edge difference
+        (shortcuts added minus edges removed, plus contracted neighbours),
+        with lazy priority updates.
+        """
+        n = len(nodes)
+        adj = [{} for _ in range(n)]
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                v, w = int(neighbors[k]), float(weights[k])
+                if v != u and w < adj[u].get(v, (float('inf'), -1))[0]:
+                    adj[u][v] = adj[v][u] = (w, -1)
+
+        deleted_neighbors = [0] * n
+
+        def priority(u):
+            return len(_shortcuts(adj, u)) - len(adj[u]) + deleted_neighbors[u]
+
+        heap = [(priority(u), u) for u in range(n)]
+        heapq.heapify(heap)
+        rank = np.zeros(n, dtype=np.int32)
+        up = [None] * n
+        order = 0
+
+        while heap:
+            _, u = heapq.heappop(heap)
+            # Lazy update: re-queue if u is no longer the cheapest to contract
+            current = priority(u)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, u))
+                continue
+
+            rank[u] = order
+            order += 1
+            up[u] = list(adj[u].items())
+            for v, w, length in _shortcuts(adj, u):
+                if length < adj[v].get(w, (float('inf'), -1))[0]:
+                    adj[v][w] = adj[w][v] = (length, u)
+            for v in adj[u]:
+                del adj[v][u]
+                deleted_neighbors[v] += 1
+            adj[u] = {}
+
+        counts = [len(edges) for edges in up]
+        up_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=up_offsets[1:])
+        up_targets = [v for edges in up for v, _ in edges]
+        up_weights = [w for edges in up for _, (w, _) in edges]
+        up_middle = [m for edges in up for _, (_, m) in edges]
+        return cls(nodes, rank, up_offsets, up_targets, up_weights, up_middle)
+
+    @classmethod
+    def from_networkx(cls, G, weight='weight'):
+        csr = CSRGraph.from_networkx(G, weight)
+        # Same edge order as the CSR arrays, but full-precision weights (CSRGraph keeps float32)
+        weights = [data.get(weight, 1.0) for node in csr.nodes for data in G[node].values()]
+        return cls.build(csr.nodes, csr.offsets, csr.neighbors, weights)
+
+    def _query(self, s, t):
+        """Bidirectional upward search; returns (distance, node index path) or (inf, None)."""
+        if s == t:
+            return 0.0, [s]
+        offsets, targets, weights = self._offsets, self._targets, self._weights
+        dist = ({s: 0.0}, {t: 0.0})
+        pred = ({s: -1}, {t: -1})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        best = float('inf')
+        meet = -1
+
+        while heaps[0] or heaps[1]:
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            d, u = heapq.heappop(heaps[side])
+            if d > dist[side][u]:
+                continue
+            if d >= best:
+                # Nothing left on this side can improve the meeting point
+                heaps[side].clear()
+                continue
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best = d + other
+                meet = u
+            side_dist = dist[side]
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                nd = d + weights[k]
+                if nd < side_dist.get(v, float('inf')):
+                    side_dist[v] = nd
+                    pred[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+
+        if meet < 0:
+            return float('inf'), None
+
+        # Upward chain s -> meet, then meet -> t
+        chain = []
+        u = meet
+        while u != -1:
+            chain.append(u)
+            u = pred[0][u]
+        chain.reverse()
+        u = pred[1][meet]
+        while u != -1:
+            chain.append(u)
+            u = pred[1][u]
+        return best, self._unpack(chain)
+
+    def _middle(self, a, b):
+        # The edge is stored at its lower-ranked end
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        start, end = self._offsets[low], self._offsets[low + 1]
+        k = start + self._targets[start:end].index(high)
+        return int(self.up_middle[k])
+
+    def _unpack(self, chain):
+        path = [chain[0]]
+        stack = [(a, b) for a, b in reversed(list(zip(chain, chain[1:])))]
+        while stack:
+            a, b = stack.pop()
+            middle = self._middle(a, b)
+            if middle < 0:
+                path.append(b)
+            else:
+                stack.append((middle, b))
+                stack.append((a, middle))
+        return path
+
+    def shortest_path_with_distance(self, start, end):
+        """Shortest path (list of nodes) and its length, or (None, inf) if unreachable."""
+        distance, path = self._query(self.index[start], self.index[end])
+        if path is None:
+            return None, float('inf')
+        return [self.nodes[i] for i in path], distance
+
+    def shortest_path_length(self, start, end):
+        return self._query(self.index[start], self.index[end])[0]
+
+def save_hierarchy(ch, path, fingerprint=None):
+    """Write the hierarchy as .npy arrays plus meta.json; fingerprint identifies the source graph."""
+    os.makedirs(path, exist_ok=True)
+    arrays = {"nodes": np.array(ch.nodes), "rank": ch.rank, "up_offsets": ch.up_offsets,
+              "up_targets": ch.up_targets, "up_weights": ch.up_weights, "up_middle": ch.up_middle}
+    for name in HIERARCHY_ARRAYS:
+        np.save(os.path.join(path, f"{name}.npy"), arrays[name])
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"num_nodes": len(ch), "num_edges": int(len(ch.up_targets)), "fingerprint": fingerprint}, f)
+
+def load_hierarchy(path, mmap=True):
+    """Load a saved hierarchy; returns (ContractionHierarchy, meta dict)."""
+    mode = 'r' if mmap else None
+    arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in HIERARCHY_ARRAYS}
+    arrays["nodes"] = arrays["nodes"].tolist()
+    with open(os.path.join(path, "meta.json"), "r") as f:
+        meta = json.load(f)
+    return ContractionHierarchy(**arrays), meta
+
+def hierarchy_for_graph(G, path=None):
+    """
+    Contraction hierarchy for an nx graph. With a path, a saved hierarchy is
+    reused if it was built from the same graph content, and a fresh one is
+    saved there otherwise.
+    """
+    if path is None:
+        return ContractionHierarchy.from_networkx(G)
+
+    fingerprint = graph_fingerprint(G)
+    if os.path.exists(os.path.join(path, "meta.json")):
+        ch, meta = load_hierarchy(path)
+        if meta.get("fingerprint") == fingerprint:
+            return ch
+
+    ch = ContractionHierarchy.from_networkx(G)
+    save_hierarchy(ch, path, fingerprint)
+    return ch
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and save a contraction hierarchy")
+    parser.add_argument("graph", nargs="?", help="converted OSM graph directory (default: the campus graph)")
+    parser.add_argument("-o", "--output", default=os.path.join("cache", "campus.ch"), help="output directory")
+    parser.add_argument("--queries", type=int, default=1000, help="random queries to time after building")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.graph:
+        from osm_graph import load_osm_graph
+        osm = load_osm_graph(args.graph)
+        ch = ContractionHierarchy.build(osm.node_ids.tolist(), osm.edge_offsets, osm.edge_targets, osm.edge_lengths)
+        save_hierarchy(ch, args.output)
+    else:
+        from graph_builder import build_csuf_graph
+        G, _ = build_csuf_graph()
+        ch = hierarchy_for_graph(G, args.output)
+    print(f"{len(ch)} nodes, {len(ch.up_targets)} upward edges in {time.perf_counter() - started:.2f}s -> {args.output}")
+
+    rng = np.random.default_rng(0)
+    pairs = rng.integers(0, len(ch), size=(args.queries, 2))
+    started = time.perf_counter()
+    for s, t in pairs:
+        ch._query(int(s), int(t))
+    print(f"{(time.perf_counter() - started) / args.queries * 1e3:.3f} ms per query")
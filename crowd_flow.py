@@ -0,0 +1,198 @@
+import argparse
+import time
+from collections import namedtuple
+import numpy as np
+from conflicts import time_to_minutes
+from data_loader import get_data
+from routing import WALKING_SPEED, get_leg_cache
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MINUTES_PER_DAY = 24 * 60
+
+# Class sessions and the walks between them, one array element per row.
+# Times are minutes from Monday 00:00; buildings are indices into a building list.
+Sessions = namedtuple('Sessions', ['building', 'start', 'end', 'count'])
+Trips = namedtuple('Trips', ['origin', 'dest', 'depart'])
+
+# Simulation output. edge_load[e, t] is the number of people walking edge e
+# during step t, building_load[b, t] the number in class at building b and
+# arrivals[b, t] the number arriving at b.
+FlowResult = namedtuple('FlowResult', ['buildings', 'edges', 'step_minutes',
+                                       'edge_load', 'building_load', 'arrivals'])
+
+def weekly_sessions(weekly_schedule, buildings):
+    """Every weekly task with a known building as (building, start, end) arrays, sorted by start."""
+    index = {building: i for i, building in enumerate(buildings)}
+    rows = []
+    for day, day_tasks in weekly_schedule.items():
+        offset = DAYS.index(day) * MINUTES_PER_DAY
+        for task in day_tasks:
+            if task['building_name'] in index:
+                rows.append((index[task['building_name']],
+                             offset + time_to_minutes(task['time_start']),
+                             offset + time_to_minutes(task['time_finish'])))
+    rows.sort(key=lambda row: row[1])
+    if not rows:
+        return (np.empty(0, dtype=np.int64),) * 3
+    return tuple(np.array(column, dtype=np.int64) for column in zip(*rows))
+
+def sample_population(weekly_schedule, buildings, n_students, attend_prob=0.6, seed=0):
+    """
+    Synthetic student body over the weekly sessions. Each student attends each
+    session with probability attend_prob, skipping sessions that clash with
+    one already attended. A student who attends two sessions on the same day
+    walks between them, leaving when the earlier one finishes.
+    The loop runs over sessions; students are handled as whole arrays.
+    Returns (Sessions, Trips).
+    """
+    rng = np.random.default_rng(seed)
+    building, start, end = weekly_sessions(weekly_schedule, buildings)
+
+    current_building = np.full(n_students, -1, dtype=np.int64)
+    current_end = np.full(n_students, -1, dtype=np.int64)
+    attendance = np.zeros(len(start), dtype=np.int64)
+    trips = []
+
+    for s in range(len(start)):
+        day_start = start[s] - start[s] % MINUTES_PER_DAY
+        # A new day starts off campus
+        new_day = current_end < day_start
+        current_building[new_day] = -1
+        attends = (rng.random(n_students) < attend_prob) & (current_end <= start[s])
+        attendance[s] = np.count_nonzero(attends)
+
+        walks = attends & (current_building >= 0)
+        trips.append((current_building[walks], np.full(np.count_nonzero(walks), building[s]), current_end[walks]))
+
+        current_building[attends] = building[s]
+        current_end[attends] = end[s]
+
+    sessions = Sessions(building, start, end, attendance)
+    if not trips:
+        empty = np.empty(0, dtype=np.int64)
+        return sessions, Trips(empty, empty, empty)
+    origin, dest, depart = (np.concatenate(column) for column in zip(*trips))
+    return sessions, Trips(origin, dest, depart)
+
+def route_table(G, buildings):
+    """
+    Shortest route between every ordered pair of buildings, flattened into
+    CSR arrays: the edges of pair p = origin * n + dest are
+    edges[offsets[p]:offsets[p + 1]], entered and left enter/leave minutes
+    after departure. total[p] is the walk time in minutes (inf if unreachable).
+    Returns (edge list, offsets, edge ids, enter, leave, total).
+    """
+    legs = get_leg_cache(G)
+    n = len(buildings)
+    edge_ids = {}
+    offsets = [0]
+    ids, enter, leave = [], [], []
+    total = np.full(n * n, np.inf)
+
+    for i, origin in enumerate(buildings):
+        for j, dest in enumerate(buildings):
+            p = i * n + j
+            if i == j:
+                total[p] = 0.0
+            else:
+                path = legs.leg(origin, dest).path
+                if path:
+                    elapsed = 0.0
+                    for u, v in zip(path, path[1:]):
+                        key = (u, v) if (v, u) not in edge_ids else (v, u)
+                        ids.append(edge_ids.setdefault(key, len(edge_ids)))
+                        enter.append(elapsed)
+                        elapsed += G[u][v]['weight'] / WALKING_SPEED / 60
+                        leave.append(elapsed)
+                    total[p] = elapsed
+            offsets.append(len(ids))
+
+    return (list(edge_ids), np.array(offsets, dtype=np.int64), np.array(ids, dtype=np.int64),
+            np.array(enter), np.array(leave), total)
+
+def _accumulate(rows, starts, ends, counts, n_rows, n_steps):
+    """Sum counts over [start, end) step ranges per row with a difference array."""
+    starts = np.clip(starts, 0, n_steps)
+    ends = np.clip(ends, 0, n_steps)
+    width = n_steps + 1
+    diff = np.bincount(rows * width + starts, weights=counts, minlength=n_rows * width)
+    diff -= np.bincount(rows * width + ends, weights=counts, minlength=n_rows * width)
+    return np.cumsum(diff.reshape(n_rows, width), axis=1)[:, :n_steps]
+
+def simulate_flow(G, buildings, sessions, trips, step_minutes=1, n_steps=None):
+    """
+    Aggregate per-edge and per-building load per time step. Trips sharing an
+    origin, destination and departure step are merged first, then each
+    group is expanded along its precomputed route, so the cost depends on
+    the number of distinct groups, not the number of students.
+    """
+    if n_steps is None:
+        n_steps = -(-len(DAYS) * MINUTES_PER_DAY // step_minutes)
+    n = len(buildings)
+    edges, offsets, edge_ids, enter, leave, total = route_table(G, buildings)
+
+    # Merge identical trips into (pair, departure step, count) groups
+    depart_step = np.asarray(trips.depart) // step_minutes
+    keys = (np.asarray(trips.origin) * n + np.asarray(trips.dest)) * n_steps + depart_step
+    keys, counts = np.unique(keys, return_counts=True)
+    pair = keys // n_steps
+    depart_step = keys % n_steps
+    reachable = np.isfinite(total[pair])
+    pair, depart_step, counts = pair[reachable], depart_step[reachable], counts[reachable]
+
+    # Expand each group into one row per edge of its route
+    lengths = offsets[pair + 1] - offsets[pair]
+    group = np.repeat(np.arange(len(pair)), lengths)
+    position = offsets[pair][group] + np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    start = depart_step[group] + np.floor(enter[position] / step_minutes).astype(np.int64)
+    end = depart_step[group] + np.ceil(leave[position] / step_minutes).astype(np.int64)
+    end = np.maximum(end, start + 1)
+    edge_load = _accumulate(edge_ids[position], start, end, counts[group].astype(float), len(edges), n_steps)
+
+    building_load = _accumulate(np.asarray(sessions.building), np.asarray(sessions.start) // step_minutes,
+                                -(-np.asarray(sessions.end) // step_minutes),
+                                np.asarray(sessions.count, dtype=float), n, n_steps)
+
+    arrive_step = np.minimum(depart_step + np.ceil(total[pair] / step_minutes).astype(np.int64), n_steps - 1)
+    arrivals = np.bincount((pair % n) * n_steps + arrive_step, weights=counts,
+                           minlength=n * n_steps).reshape(n, n_steps)
+
+    return FlowResult(list(buildings), edges, step_minutes,
+                      edge_load.astype(np.int64), building_load.astype(np.int64), arrivals.astype(np.int64))
+
+def step_label(step, step_minutes):
+    minute = step * step_minutes
+    day, minute = divmod(minute, MINUTES_PER_DAY)
+    return f"{DAYS[day]} {minute // 60:02d}:{minute % 60:02d}"
+
+def busiest(load, names, step_minutes, top=5):
+    """[(name, step label, load)] for the top cells of a load array."""
+    flat = np.argsort(load, axis=None)[::-1][:top]
+    rows, steps = np.unravel_index(flat, load.shape)
+    return [(names[r], step_label(s, step_minutes), int(load[r, s])) for r, s in zip(rows, steps)]
+
+if __name__ == "__main__":
+    from graph_builder import build_csuf_graph
+
+    parser = argparse.ArgumentParser(description="Simulate walking load on campus paths between classes")
+    parser.add_argument("--students", type=int, default=30000)
+    parser.add_argument("--attend", type=float, default=0.6, help="probability a student attends each session")
+    parser.add_argument("--step", type=int, default=1, help="time step in minutes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    G, _ = build_csuf_graph()
+    buildings = list(G.nodes())
+
+    started = time.perf_counter()
+    sessions, trips = sample_population(get_data().weekly_schedule, buildings, args.students, args.attend, args.seed)
+    result = simulate_flow(G, buildings, sessions, trips, args.step)
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.students} students, {len(trips.origin)} trips simulated in {elapsed:.2f}s")
+    print("Busiest paths:")
+    for (u, v), when, load in busiest(result.edge_load, result.edges, args.step):
+        print(f"  {u} - {v} at {when}: {load} walking")
+    print("Busiest arrivals:")
+    for building, when, load in busiest(result.arrivals, result.buildings, args.step):
+        print(f"  {building} at {when}: {load} arriving")
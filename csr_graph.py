@@ -0,0 +1,199 @@
+import heapq
+import math
+import numpy as np
+
+class CSRGraph:
+    """
+    Compressed sparse row adjacency for the campus graph. Neighbours of node i
+    are neighbors[offsets[i]:offsets[i+1]] with float32 edge weights alongside.
+    Nodes are addressed by name in the public methods, like an nx.Graph.
+    """
+
+    def __init__(self, nodes, offsets, neighbors, weights, coords=None):
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.neighbors = np.asarray(neighbors, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        # Optional (lat, lon) per node in radians, used by the A* heuristic
+        self.coords = None if coords is None else np.radians(np.asarray(coords, dtype=np.float64))
+
+    @classmethod
+    def from_networkx(cls, G, weight='weight'):
+        nodes = list(G.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+
+        counts = np.fromiter((len(G[node]) for node in nodes), dtype=np.int64, count=len(nodes))
+        offsets = np.zeros(len(nodes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        neighbors = np.empty(offsets[-1], dtype=np.int32)
+        weights = np.empty(offsets[-1], dtype=np.float32)
+        for i, node in enumerate(nodes):
+            start = offsets[i]
+            for k, (other, data) in enumerate(G[node].items()):
+                neighbors[start + k] = index[other]
+                weights[start + k] = data.get(weight, 1.0)
+
+        # Nodes store pos=(lon, lat); keep coordinates only if every node has them.
+        # A* assumes edge weights are at least the straight-line distance in meters.
+        coords = None
+        positions = [G.nodes[node].get('pos') for node in nodes]
+        if nodes and all(p is not None for p in positions):
+            coords = [(lat, lon) for lon, lat in positions]
+
+        return cls(nodes, offsets, neighbors, weights, coords)
+
+    def apply_change(self, change):
+        """
+        Patch the arrays for a routing.GraphChange instead of rebuilding from
+        the nx graph: the node's removed edges are deleted from both ends, its
+        added edges appended to both ends (the order nx.Graph keeps), and the
+        node itself appended or deleted. Every step is a vectorized array
+        operation, but CSR arrays are contiguous, so each still copies O(n + m)
+        entries; only the per-edge Python loop of from_networkx() is avoided.
+        """
+        if change.kind == 'add':
+            self.nodes.append(change.node)
+            self.index[change.node] = len(self.nodes) - 1
+            self.offsets = np.append(self.offsets, self.offsets[-1])
+            if self.coords is not None:
+                if change.new_pos is None:
+                    self.coords = None
+                else:
+                    lon, lat = change.new_pos
+                    self.coords = np.vstack([self.coords, np.radians([[lat, lon]])])
+        i = self.index[change.node]
+        n = len(self.nodes)
+
+        if change.removed_edges:
+            others = np.array([self.index[v if u == change.node else u] for u, v, _ in change.removed_edges],
+                              dtype=np.int64)
+            rows = np.repeat(np.arange(n), np.diff(self.offsets))
+            drop = ((rows == i) & np.isin(self.neighbors, others)) | ((self.neighbors == i) & np.isin(rows, others))
+            keep = ~drop
+            self.neighbors = self.neighbors[keep]
+            self.weights = self.weights[keep]
+            counts = np.bincount(rows[keep], minlength=n)
+            self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        if change.added_edges:
+            others = np.array([self.index[v if u == change.node else u] for u, v, _ in change.added_edges],
+                              dtype=np.int64)
+            lengths = np.array([w for _, _, w in change.added_edges], dtype=np.float32)
+            # Insert before the end of each segment: i's edges in order, then i at the end of each other's segment
+            at = np.concatenate((np.full(len(others), self.offsets[i + 1]), self.offsets[others + 1]))
+            segment = np.concatenate((np.full(len(others), i), others))
+            # Empty segments share an offset, so order equal positions by segment too
+            order = np.lexsort((segment, at))
+            self.neighbors = np.insert(self.neighbors, at[order],
+                                       np.concatenate((others, np.full(len(others), i)))[order].astype(np.int32))
+            self.weights = np.insert(self.weights, at[order], np.concatenate((lengths, lengths))[order])
+            counts = np.diff(self.offsets)
+            counts[i] += len(others)
+            counts[others] += 1
+            self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        if change.kind == 'move' and self.coords is not None and change.new_pos is not None:
+            lon, lat = change.new_pos
+            self.coords[i] = np.radians([lat, lon])
+        elif change.kind == 'remove':
+            # The node has no edges left; drop its empty segment and renumber the nodes after it
+            self.offsets = np.delete(self.offsets, i + 1)
+            self.neighbors = np.where(self.neighbors > i, self.neighbors - 1, self.neighbors).astype(np.int32)
+            del self.nodes[i]
+            self.index = {node: k for k, node in enumerate(self.nodes)}
+            if self.coords is not None:
+                self.coords = np.delete(self.coords, i, axis=0)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def _heuristic(self, target):
+        """Haversine distance to the target in meters, a lower bound on walking distance."""
+        if self.coords is None:
+            return None
+        lat, lon = self.coords[:, 0], self.coords[:, 1]
+        lat2, lon2 = self.coords[target]
+        a = np.sin((lat2 - lat) / 2) ** 2 + np.cos(lat) * np.cos(lat2) * np.sin((lon2 - lon) / 2) ** 2
+        # Slightly shrink the bound so float32 edge weights never make it inadmissible
+        return 6371.0 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a)) * 1000 * (1 - 1e-6)
+
+    def _search(self, sources, target=None, cutoff=None, heuristic=None):
+        """
+        Dijkstra (or A* when a heuristic array is given) over node indices from
+        one source index or a list of them. Returns the distance and predecessor
+        arrays; unreached nodes are inf / -1.
+        """
+        n = len(self.nodes)
+        dist = np.full(n, np.inf)
+        pred = np.full(n, -1, dtype=np.int64)
+        done = np.zeros(n, dtype=bool)
+        sources = [sources] if np.isscalar(sources) else list(sources)
+        dist[sources] = 0.0
+
+        heap = [(0.0 if heuristic is None else float(heuristic[s]), s) for s in sources]
+        heapq.heapify(heap)
+        while heap:
+            _, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            if u == target:
+                break
+
+            # Relax all edges of u at once
+            start, end = self.offsets[u], self.offsets[u + 1]
+            nbrs = self.neighbors[start:end]
+            candidate = dist[u] + self.weights[start:end]
+            better = candidate < dist[nbrs]
+            if cutoff is not None:
+                better &= candidate <= cutoff
+            if not better.any():
+                continue
+            nbrs = nbrs[better]
+            candidate = candidate[better]
+            dist[nbrs] = candidate
+            pred[nbrs] = u
+
+            keys = candidate if heuristic is None else candidate + heuristic[nbrs]
+            for key, v in zip(keys.tolist(), nbrs.tolist()):
+                heapq.heappush(heap, (key, v))
+
+        return dist, pred
+
+    def _unpack(self, pred, source, target):
+        path = [target]
+        while path[-1] != source:
+            path.append(int(pred[path[-1]]))
+        path.reverse()
+        return [self.nodes[i] for i in path]
+
+    def dijkstra(self, source, cutoff=None):
+        """Distances in meters from source to every node (inf where unreachable)."""
+        dist, _ = self._search(self.index[source], cutoff=cutoff)
+        return dist
+
+    def multi_source_dijkstra(self, sources, cutoff=None):
+        """Distance in meters from the nearest of several sources to every node."""
+        dist, _ = self._search([self.index[s] for s in sources], cutoff=cutoff)
+        return dist
+
+    def shortest_path_with_distance(self, source, target):
+        """A* (or Dijkstra without coordinates) between two nodes; (None, inf) if unreachable."""
+        s, t = self.index[source], self.index[target]
+        if s == t:
+            return [source], 0.0
+        dist, pred = self._search(s, target=t, heuristic=self._heuristic(t))
+        if math.isinf(dist[t]):
+            return None, math.inf
+        return self._unpack(pred, s, t), float(dist[t])
+
+    def shortest_path(self, source, target):
+        return self.shortest_path_with_distance(source, target)[0]
+
+    def shortest_path_length(self, source, target):
+        return self.shortest_path_with_distance(source, target)[1]
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import pickle
+import sys
+
+# Data files live next to the code, whatever the working directory
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCATIONS_PATH = os.path.join(DATA_DIR, 'csuf_locations.json')
+TASKS_PATH = os.path.join(DATA_DIR, 'tasks.json')
+WEEKLY_PATH = os.path.join(DATA_DIR, 'weekly_tasks.json')
+SNAPSHOT_PATH = os.path.join(DATA_DIR, 'cache', 'data_snapshot.pickle')
+
+# Bump when CampusData changes shape so old snapshots are ignored
+SNAPSHOT_VERSION = 2
+
+PRIORITIES = ("HIGH", "MEDIUM", "LOW")
+TASK_FIELDS = ('task_name', 'building_name', 'time_start', 'time_finish', 'priority')
+
+class CampusData:
+    """
+    Locations, task catalog and weekly schedule, loaded and validated once.
+    issues lists (source, task_name, problem) for rows that will not route,
+    such as tasks in unknown buildings; the rows themselves are kept as-is.
+    """
+
+    def __init__(self, locations, tasks_data, weekly_data):
+        self.locations = locations
+        self.tasks_data = tasks_data
+        self.tasks = tasks_data['tasks']
+        self.weekly_data = weekly_data
+        self.weekly_schedule = weekly_data['weekly_schedule']
+        self.issues = []
+        self._intern_and_validate()
+
+    def snapshot_state(self):
+        # Plain containers only, so a snapshot never refers to this class (or __main__.CampusData)
+        return {'locations': self.locations, 'tasks_data': self.tasks_data,
+                'weekly_data': self.weekly_data, 'issues': self.issues}
+
+    @classmethod
+    def from_snapshot_state(cls, state):
+        """Rebuild already validated data from snapshot_state() without validating it again."""
+        data = cls.__new__(cls)
+        data.locations = state['locations']
+        data.tasks_data = state['tasks_data']
+        data.tasks = data.tasks_data['tasks']
+        data.weekly_data = state['weekly_data']
+        data.weekly_schedule = data.weekly_data['weekly_schedule']
+        data.issues = state['issues']
+        return data
+
+    def _intern_and_validate(self):
+        # Share one string object per building name across all tables
+        self.locations = {sys.intern(name): coords for name, coords in self.locations.items()}
+
+        sources = [("tasks.json", self.tasks)]
+        sources += [(f"weekly_tasks.json:{day}", day_tasks) for day, day_tasks in self.weekly_schedule.items()]
+        for source, tasks in sources:
+            for task in tasks:
+                problem = self._validate(task)
+                if problem:
+                    self.issues.append((source, task.get('task_name'), problem))
+                else:
+                    task['building_name'] = sys.intern(task['building_name'])
+                    task['priority'] = sys.intern(task['priority'])
+
+    def _validate(self, task):
+        missing = [field for field in TASK_FIELDS if field not in task]
+        if missing:
+            return f"missing fields: {', '.join(missing)}"
+        for field in ('time_start', 'time_finish'):
+            hours, _, minutes = task[field].partition(':')
+            if not (hours.isdigit() and minutes.isdigit() and int(hours) < 24 and int(minutes) < 60):
+                return f"bad {field} '{task[field]}'"
+        if task['priority'] not in PRIORITIES:
+            return f"unknown priority '{task['priority']}'"
+        if task['building_name'] not in self.locations:
+            return f"unknown building '{task['building_name']}'"
+        return None
+
+def _file_state(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _read_snapshot(sources, snapshot_path):
+    """
+    Return the snapshot's CampusData if it still matches the source files. Unchanged
+    mtimes are trusted outright; otherwise the file hashes are compared, and a
+    snapshot that survives only on hashes is rewritten with the new mtimes.
+    """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if snapshot.get('version') != SNAPSHOT_VERSION or set(snapshot['sources']) != set(sources):
+        return None
+
+    refreshed = False
+    for name, path in sources.items():
+        mtime, size, digest = snapshot['sources'][name]
+        if _file_state(path) == (mtime, size):
+            continue
+        if _file_hash(path) != digest:
+            return None
+        refreshed = True
+
+    data = CampusData.from_snapshot_state(snapshot['data'])
+    if refreshed:
+        try:
+            _write_snapshot(sources, data, snapshot_path)
+        except OSError:
+            # Still valid by hash; the mtimes are just rechecked next time
+            pass
+    return data
+
+def _write_snapshot(sources, data, snapshot_path):
+    states = {name: _file_state(path) + (_file_hash(path),) for name, path in sources.items()}
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    tmp_path = snapshot_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': SNAPSHOT_VERSION, 'sources': states, 'data': data.snapshot_state()}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+
+def load_data(locations_path=LOCATIONS_PATH, tasks_path=TASKS_PATH, weekly_path=WEEKLY_PATH,
+              snapshot_path=SNAPSHOT_PATH):
+    """Load CampusData from the binary snapshot, or parse, validate and snapshot the JSON files."""
+    sources = {'locations': locations_path, 'tasks': tasks_path, 'weekly': weekly_path}
+    data = _read_snapshot(sources, snapshot_path) if snapshot_path else None
+    if data is not None:
+        return data
+
+    with open(locations_path, 'r') as f:
+        locations = json.load(f)
+    with open(tasks_path, 'r') as f:
+        tasks_data = json.load(f)
+    with open(weekly_path, 'r') as f:
+        weekly_data = json.load(f)
+
+    data = CampusData(locations, tasks_data, weekly_data)
+    if snapshot_path:
+        try:
+            _write_snapshot(sources, data, snapshot_path)
+        except OSError:
+            # A read-only checkout still works, it just parses JSON every time
+            pass
+    return data
+
+_data = None
+
+def get_data():
+    """The process-wide CampusData, loaded on first use."""
+    global _data
+    if _data is None:
+        _data = load_data()
+    return _data
+
+def save_tasks(data=None):
+    """Write the task catalog back to tasks.json; the snapshot refreshes on next load."""
+    data = data or get_data()
+    data.tasks_data['tasks'] = data.tasks
+    with open(TASKS_PATH, 'w') as f:
+        json.dump(data.tasks_data, f, indent=2)
+
+if __name__ == "__main__":
+    data = get_data()
+    print(f"{len(data.locations)} locations, {len(data.tasks)} tasks, "
+          f"{sum(len(t) for t in data.weekly_schedule.values())} weekly tasks")
+    for source, task_name, problem in data.issues:
+        print(f"  {source}: {task_name}: {problem}")
@@ -0,0 +1,270 @@
+import math
+import time
+import numpy as np
+from conflicts import time_to_minutes
+from routing import travel_matrix
+
+# Errands can be fitted between these times when there is no class before or after them
+DAY_START = "07:00"
+DAY_END = "22:00"
+
+# Up to this many errands the placement is solved exactly with bitmask DP
+EXACT_ERRAND_LIMIT = 8
+
+def minutes_to_time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+class _Gap:
+    """Free time between two fixed tasks; origin/dest are building indices, -1 at either end of the day."""
+
+    def __init__(self, origin, dest, start, end):
+        self.origin = origin
+        self.dest = dest
+        self.start = start
+        self.end = end
+
+def _add_to_front(front, candidate):
+    # Keep candidate (meters, minute, order) unless another state is no longer and no later
+    if front is None:
+        return [candidate]
+    meters, t = candidate[0], candidate[1]
+    if any(m <= meters and u <= t for m, u, _ in front):
+        return front
+    return [state for state in front if not (meters <= state[0] and t <= state[1])] + [candidate]
+
+class ErrandPlanner:
+    """
+    Fits untimed errands into the gaps of a fixed schedule (such as an
+    optimize_schedule() result). An errand has a building_name, a duration in
+    minutes and an optional "deadline" ("HH:MM") by which it must be finished.
+    Walking costs come from one travel matrix over every building involved;
+    walks are rounded up to whole minutes.
+    """
+
+    def __init__(self, G, schedule, errands, day_start=DAY_START, day_end=DAY_END):
+        self.schedule = sorted(schedule, key=lambda t: time_to_minutes(t['time_start']))
+        self.errands = list(errands)
+
+        buildings = list(dict.fromkeys([t['building_name'] for t in self.schedule] +
+                                       [e['building_name'] for e in self.errands if e['building_name'] in G]))
+        index = {building: i for i, building in enumerate(buildings)}
+        times, self.dist = travel_matrix(G, buildings, buildings) if buildings else (np.empty((0, 0)),) * 2
+        self.walk = np.where(np.isfinite(times), np.ceil(times), np.inf)
+
+        self.building = [index.get(e['building_name'], -1) for e in self.errands]
+        self.duration = [int(e['duration']) for e in self.errands]
+        self.deadline = [time_to_minutes(e['deadline']) if e.get('deadline') else math.inf for e in self.errands]
+
+        # One gap before the first task, between each pair of tasks and after the last
+        self.gaps = []
+        previous, previous_end = -1, time_to_minutes(day_start)
+        for task in self.schedule:
+            self.gaps.append(_Gap(previous, index[task['building_name']], previous_end,
+                                  time_to_minutes(task['time_start'])))
+            previous, previous_end = index[task['building_name']], time_to_minutes(task['time_finish'])
+        self.gaps.append(_Gap(previous, -1, previous_end, time_to_minutes(day_end)))
+
+        # Gaps too short for any single errand are never sequenced
+        errands = [e for e in range(len(self.errands)) if self.building[e] >= 0]
+        self.open = [any(self._sequence(gap, [e]) is not None for e in errands) for gap in self.gaps]
+
+    def _sequence(self, gap, order):
+        """
+        (added meters, start minute of each errand) for visiting order inside
+        gap, or None if infeasible. The walk from origin to dest is owed anyway,
+        so an empty order always costs nothing, even when that walk itself
+        does not fit (back-to-back classes, or a task ending after day_end).
+        """
+        if not order:
+            return 0.0, []
+        t = gap.start
+        meters = 0.0
+        previous = gap.origin
+        starts = []
+        for e in order:
+            building = self.building[e]
+            if previous >= 0:
+                t += self.walk[previous, building]
+                meters += self.dist[previous, building]
+            if t + self.duration[e] > self.deadline[e]:
+                return None
+            starts.append(t)
+            t += self.duration[e]
+            previous = building
+        if gap.dest >= 0 and previous >= 0:
+            t += self.walk[previous, gap.dest]
+            meters += self.dist[previous, gap.dest]
+        if t > gap.end:
+            return None
+        if gap.origin >= 0 and gap.dest >= 0:
+            meters -= self.dist[gap.origin, gap.dest]
+        return meters, starts
+
+    def cheapest_insertion(self):
+        """
+        Repeatedly insert the errand, gap and position that adds the least
+        walking while keeping every gap feasible. Returns one errand order per gap.
+        """
+        orders = [[] for _ in self.gaps]
+        costs = [0.0] * len(self.gaps)
+        remaining = [e for e in range(len(self.errands)) if self.building[e] >= 0]
+
+        while remaining:
+            best = None
+            for e in remaining:
+                for g, gap in enumerate(self.gaps):
+                    if not self.open[g]:
+                        continue
+                    for position in range(len(orders[g]) + 1):
+                        order = orders[g][:position] + [e] + orders[g][position:]
+                        result = self._sequence(gap, order)
+                        if result is not None and (best is None or result[0] - costs[g] < best[0]):
+                            best = (result[0] - costs[g], e, g, order, result[0])
+            if best is None:
+                break
+            _, e, g, order, cost = best
+            orders[g] = order
+            costs[g] = cost
+            remaining.remove(e)
+        return orders
+
+    def _gap_subsets(self, gap, errands):
+        """Least added walking (and its order) for each subset of errands placed in gap, by bitmask."""
+        k = len(errands)
+        # fronts[mask][i]: Pareto front of (meters from the gap origin, minute, order) ending at
+        # errands[i] after visiting mask. Walks are rounded up per leg, so a longer walk can
+        # still arrive earlier, and only such a state may meet a later deadline.
+        fronts = [[None] * k for _ in range(1 << k)]
+        for i, e in enumerate(errands):
+            result = self._sequence(_Gap(gap.origin, -1, gap.start, math.inf), [e])
+            if result is not None:
+                fronts[1 << i][i] = [(result[0], result[1][0] + self.duration[e], [e])]
+
+        for mask in range(1, 1 << k):
+            for i in range(k):
+                if fronts[mask][i] is None:
+                    continue
+                here = self.building[errands[i]]
+                for meters, t, order in fronts[mask][i]:
+                    for j in range(k):
+                        if mask & (1 << j):
+                            continue
+                        e = errands[j]
+                        start = t + self.walk[here, self.building[e]]
+                        if start + self.duration[e] > self.deadline[e] or start + self.duration[e] > gap.end:
+                            continue
+                        candidate = (meters + self.dist[here, self.building[e]], start + self.duration[e], order + [e])
+                        fronts[mask | (1 << j)][j] = _add_to_front(fronts[mask | (1 << j)][j], candidate)
+
+        subsets = {0: (0.0, [])}
+        for mask in range(1, 1 << k):
+            for front in fronts[mask]:
+                for state in front or ():
+                    result = self._sequence(gap, state[2])
+                    if result is not None and (mask not in subsets or result[0] < subsets[mask][0]):
+                        subsets[mask] = (result[0], state[2])
+        return subsets
+
+    def exact(self):
+        """
+        Bitmask DP: the cheapest order for every subset of errands in every
+        gap, then the best split of errands across gaps. Places as many
+        errands as possible, then minimizes added walking.
+        """
+        errands = [e for e in range(len(self.errands)) if self.building[e] >= 0]
+        k = len(errands)
+        full = 1 << k
+
+        # placed[mask]: (added meters, orders per gap so far) using exactly the errands in mask
+        placed = {0: (0.0, [])}
+        for gap, is_open in zip(self.gaps, self.open):
+            subsets = self._gap_subsets(gap, errands) if is_open else {0: (0.0, [])}
+            combined = {}
+            for mask, (meters, orders) in placed.items():
+                rest = (full - 1) & ~mask
+                subset = rest
+                while True:
+                    if subset in subsets:
+                        total = meters + subsets[subset][0]
+                        key = mask | subset
+                        if key not in combined or total < combined[key][0]:
+                            combined[key] = (total, orders + [subsets[subset][1]])
+                    if subset == 0:
+                        break
+                    subset = (subset - 1) & rest
+            placed = combined
+
+        best_mask = max(placed, key=lambda mask: (bin(mask).count("1"), -placed[mask][0]))
+        return placed[best_mask][1]
+
+    def plan(self, orders):
+        """Merge the fixed schedule with the errands placed by orders (one list per gap)."""
+        merged = list(self.schedule)
+        added = 0.0
+        placed = set()
+        for gap, order in zip(self.gaps, orders):
+            result = self._sequence(gap, order)
+            if result is None:
+                # Errands of an infeasible order stay unscheduled
+                continue
+            meters, starts = result
+            added += meters
+            for e, start in zip(order, starts):
+                start = int(start)
+                merged.append(dict(self.errands[e], time_start=minutes_to_time(start),
+                                   time_finish=minutes_to_time(start + self.duration[e])))
+                placed.add(e)
+        merged.sort(key=lambda t: time_to_minutes(t['time_start']))
+        unscheduled = [errand for e, errand in enumerate(self.errands) if e not in placed]
+        return merged, unscheduled, added
+
+def schedule_errands(G, schedule, errands, day_start=DAY_START, day_end=DAY_END, exact_limit=EXACT_ERRAND_LIMIT):
+    """
+    Insert untimed errands into the gaps of a fixed schedule, minimizing the
+    added walking. Uses exact bitmask DP for up to exact_limit errands and
+    cheapest insertion beyond that. Returns (schedule with errands given
+    time_start/time_finish, errands that did not fit, added meters).
+    """
+    planner = ErrandPlanner(G, schedule, errands, day_start, day_end)
+    if len(planner.errands) <= exact_limit:
+        orders = planner.exact()
+    else:
+        orders = planner.cheapest_insertion()
+    return planner.plan(orders)
+
+if __name__ == "__main__":
+    from data_loader import get_data
+    from graph_builder import build_csuf_graph
+    from solver import optimize_schedule
+
+    G, _ = build_csuf_graph()
+    monday = optimize_schedule([t for t in get_data().weekly_schedule["Monday"] if t['building_name'] in G])
+    errands = [
+        {"task_name": "Pick up textbooks", "building_name": "Bookstore/ Titan Shops", "duration": 15, "priority": "LOW"},
+        {"task_name": "Return library books", "building_name": "Pollack Library", "duration": 10,
+         "deadline": "12:00", "priority": "MEDIUM"},
+        {"task_name": "Print lab report", "building_name": "Computer Science", "duration": 20, "priority": "HIGH"},
+    ]
+
+    started = time.perf_counter()
+    merged, unscheduled, added = schedule_errands(G, monday, errands)
+    print(f"Placed {len(errands) - len(unscheduled)} of {len(errands)} errands, "
+          f"{added:.0f} m extra walking ({(time.perf_counter() - started) * 1000:.1f} ms)")
+    for task in merged:
+        print(f"  {task['time_start']}-{task['time_finish']} {task['task_name']} ({task['building_name']})")
+    for errand in unscheduled:
+        print(f"  Could not fit: {errand['task_name']}")
+
+    # Regression: no gap may crash the planner, including back-to-back classes in
+    # different buildings and tasks running past DAY_END (Friday and Sunday)
+    back_to_back = [
+        {"task_name": "Lecture", "building_name": "McCarthy Hall", "time_start": "09:00", "time_finish": "10:00"},
+        {"task_name": "Lab", "building_name": "Computer Science", "time_start": "10:00", "time_finish": "11:00"},
+        {"task_name": "Late review", "building_name": "Pollack Library", "time_start": "21:30", "time_finish": "22:30"},
+    ]
+    for name, schedule in [("back-to-back", back_to_back)] + list(get_data().weekly_schedule.items()):
+        schedule = [t for t in schedule if t['building_name'] in G]
+        for limit in (EXACT_ERRAND_LIMIT, 0):
+            merged, unscheduled, added = schedule_errands(G, schedule, errands, exact_limit=limit)
+            assert added >= 0 and len(merged) - len(schedule) + len(unscheduled) == len(errands), name
+    print("Back-to-back and weekly schedules planned without errors")
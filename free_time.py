@@ -0,0 +1,135 @@
+import numpy as np
+from conflicts import time_to_minutes
+from data_loader import get_data
+
+# Intervals are half-open [start, end) in integer minutes after midnight,
+# stored as an (n, 2) int32 array that is sorted and non-overlapping
+DAY_START = 0
+DAY_END = 24 * 60
+
+def _as_intervals(intervals):
+    return np.asarray(intervals, dtype=np.int32).reshape(-1, 2)
+
+def normalize(intervals):
+    """Sort intervals, drop empty ones and merge any that overlap or touch."""
+    intervals = _as_intervals(intervals)
+    intervals = intervals[intervals[:, 1] > intervals[:, 0]]
+    if len(intervals) == 0:
+        return intervals
+    intervals = intervals[np.argsort(intervals[:, 0], kind='stable')]
+
+    # A new block starts wherever the start is past every earlier end
+    running_end = np.maximum.accumulate(intervals[:, 1])
+    new_block = np.empty(len(intervals), dtype=bool)
+    new_block[0] = True
+    new_block[1:] = intervals[1:, 0] > running_end[:-1]
+    block_starts = np.flatnonzero(new_block)
+    block_ends = np.append(block_starts[1:], len(intervals)) - 1
+    return np.stack([intervals[block_starts, 0], running_end[block_ends]], axis=1)
+
+def _coverage(interval_sets):
+    # Boundaries and how many of the sets cover each elementary segment between them
+    arrays = [_as_intervals(s) for s in interval_sets]
+    starts = np.concatenate([a[:, 0] for a in arrays]) if arrays else np.empty(0, dtype=np.int32)
+    ends = np.concatenate([a[:, 1] for a in arrays]) if arrays else np.empty(0, dtype=np.int32)
+    points = np.concatenate([starts, ends])
+    deltas = np.concatenate([np.ones(len(starts), dtype=np.int32), -np.ones(len(ends), dtype=np.int32)])
+    boundaries, inverse = np.unique(points, return_inverse=True)
+    counts = np.cumsum(np.bincount(inverse, weights=deltas, minlength=len(boundaries)))
+    return boundaries, counts
+
+def _segments_where(boundaries, mask):
+    # Merge the elementary segments [boundaries[i], boundaries[i+1]) selected by mask
+    if len(boundaries) < 2:
+        return np.empty((0, 2), dtype=np.int32)
+    segments = np.stack([boundaries[:-1], boundaries[1:]], axis=1)[mask[:-1]]
+    return normalize(segments)
+
+def union(*interval_sets):
+    if not interval_sets:
+        return np.empty((0, 2), dtype=np.int32)
+    return normalize(np.concatenate([_as_intervals(s) for s in interval_sets]))
+
+def intersection(*interval_sets):
+    """Minutes covered by every set (each set is normalized first)."""
+    sets = [normalize(s) for s in interval_sets]
+    boundaries, counts = _coverage(sets)
+    return _segments_where(boundaries, counts == len(sets))
+
+def complement(intervals, lo=DAY_START, hi=DAY_END):
+    """Gaps in the intervals within the window [lo, hi)."""
+    merged = normalize(np.clip(_as_intervals(intervals), lo, hi))
+    edges = np.concatenate([[lo], merged.ravel(), [hi]]).astype(np.int32)
+    gaps = edges.reshape(-1, 2)
+    return gaps[gaps[:, 1] > gaps[:, 0]]
+
+def difference(a, b):
+    """Minutes in a that are not in b."""
+    a = normalize(a)
+    if len(a) == 0:
+        return a
+    return intersection(a, complement(b, min(DAY_START, a[0, 0]), max(DAY_END, a[-1, 1])))
+
+def with_min_length(intervals, minutes):
+    intervals = _as_intervals(intervals)
+    return intervals[intervals[:, 1] - intervals[:, 0] >= minutes]
+
+def busy_intervals(day_tasks):
+    return normalize([(time_to_minutes(t['time_start']), time_to_minutes(t['time_finish'])) for t in day_tasks])
+
+def weekly_busy(weekly_schedule):
+    """Busy intervals for each day of a weekly_schedule."""
+    return {day: busy_intervals(day_tasks) for day, day_tasks in weekly_schedule.items()}
+
+def free_windows(weekly_schedule, lo=8 * 60, hi=22 * 60, min_length=0):
+    """Free windows for each day of a weekly_schedule within [lo, hi)."""
+    return {day: with_min_length(complement(busy, lo, hi), min_length)
+            for day, busy in weekly_busy(weekly_schedule).items()}
+
+def _schedule_arrays(schedules, day):
+    # Flatten one day of many schedules into start/end/owner arrays
+    starts, ends, owners = [], [], []
+    for owner, weekly_schedule in enumerate(schedules):
+        for task in weekly_schedule.get(day, ()):
+            starts.append(time_to_minutes(task['time_start']))
+            ends.append(time_to_minutes(task['time_finish']))
+            owners.append(owner)
+    return (np.array(starts, dtype=np.int32), np.array(ends, dtype=np.int32),
+            np.array(owners, dtype=np.int64))
+
+def common_free_slots(schedules, day, min_length=0, lo=8 * 60, hi=22 * 60):
+    """
+    Windows on the given day when every schedule is free, e.g. to place a
+    meeting for a whole group. All busy intervals are merged in one pass, so
+    the cost is O(total tasks log total tasks) regardless of group size.
+    """
+    starts, ends, _ = _schedule_arrays(schedules, day)
+    return with_min_length(complement(np.stack([starts, ends], axis=1), lo, hi), min_length)
+
+def free_minutes_per_schedule(schedules, day, lo=8 * 60, hi=22 * 60):
+    """
+    Total free minutes in [lo, hi) on the given day for each schedule, computed
+    for all schedules at once without a per-schedule loop.
+    """
+    starts, ends, owners = _schedule_arrays(schedules, day)
+    starts = np.clip(starts, lo, hi).astype(np.int64)
+    ends = np.clip(ends, lo, hi).astype(np.int64)
+
+    # Offset each owner's timeline so one sort and one running max merge every schedule
+    span = hi - lo + 1
+    order = np.lexsort((starts, owners))
+    owners = owners[order]
+    starts = starts[order] + owners * span
+    ends = ends[order] + owners * span
+
+    previous_end = np.maximum.accumulate(ends)
+    previous_end = np.concatenate([[np.iinfo(np.int64).min], previous_end[:-1]])
+    # Only the part of each interval beyond everything before it adds busy time
+    covered = np.clip(ends - np.maximum(starts, previous_end), 0, None)
+    busy = np.bincount(owners, weights=covered, minlength=len(schedules))
+    return (hi - lo) - busy.astype(np.int64)
+
+if __name__ == "__main__":
+    for day, windows in free_windows(get_data().weekly_schedule, min_length=30).items():
+        slots = ", ".join(f"{s // 60:02d}:{s % 60:02d}-{e // 60:02d}:{e % 60:02d}" for s, e in windows)
+        print(f"{day}: {slots}")
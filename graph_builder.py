@@ -1,6 +1,9 @@
-import json
 import networkx as nx
 import math
+import numpy as np
+from data_loader import get_data
+from graph_utils import graph_signature, haversine_np
+from routing import GraphChange, apply_graph_change
 
 def calculate_distance(lat1, lon1, lat2, lon2):
     """
@@ -31,9 +34,8 @@ def build_csuf_graph():
     Build a graph representing the CSUF campus with buildings as nodes and
     paths as edges. Edge weights represent the distance between buildings.
     """
-    # Load location data from JSON file
-    with open('csuf_locations.json', 'r') as f:
-        csuf_locations = json.load(f)
+    # Load location data (parsed once per process by the data layer)
+    csuf_locations = get_data().locations
     
     # Create a new graph
     G = nx.Graph()
@@ -60,6 +62,64 @@ def build_csuf_graph():
     
     return G, csuf_locations
 
+def _connect_to_all(G, name):
+    """Edges from name to every other positioned node, as (name, other, meters) triples."""
+    lon, lat = G.nodes[name]['pos']
+    others = [node for node, pos in G.nodes(data='pos') if node != name and pos is not None]
+    if not others:
+        return []
+    coords = np.array([G.nodes[node]['pos'] for node in others], dtype=float)
+    distances = haversine_np(lat, lon, coords[:, 1], coords[:, 0])
+    return list(zip([name] * len(others), others, distances.tolist()))
+
+def _commit_change(G, kind, name, old_pos, new_pos, removed, added, old_signature):
+    # Bump the version so signature-keyed caches notice, then update the derived ones in place
+    G.graph['version'] = G.graph.get('version', 0) + 1
+    apply_graph_change(G, GraphChange(kind, name, old_pos, new_pos, removed, added, old_signature))
+
+def add_location(G, name, lat, lon, locations=None):
+    """
+    Add a building to a campus graph built by build_csuf_graph(), connected to
+    every other building like the rest. Costs O(n); route legs and caches not
+    affected by the new node are kept. locations, if given, is updated too.
+    """
+    if name in G:
+        raise ValueError(f"Location '{name}' already exists")
+    old_signature = graph_signature(G)
+    G.add_node(name, pos=(lon, lat))
+    added = _connect_to_all(G, name)
+    G.add_weighted_edges_from(added)
+    if locations is not None:
+        locations[name] = [lat, lon]
+    _commit_change(G, 'add', name, None, (lon, lat), [], added, old_signature)
+
+def move_location(G, name, lat, lon, locations=None):
+    """Move a building to new coordinates, recomputing only its own edges."""
+    if name not in G:
+        raise KeyError(f"Location '{name}' not found")
+    old_signature = graph_signature(G)
+    old_pos = G.nodes[name]['pos']
+    removed = list(G.edges(name, data='weight'))
+    G.remove_edges_from(removed)
+    G.nodes[name]['pos'] = (lon, lat)
+    added = _connect_to_all(G, name)
+    G.add_weighted_edges_from(added)
+    if locations is not None:
+        locations[name] = [lat, lon]
+    _commit_change(G, 'move', name, old_pos, (lon, lat), removed, added, old_signature)
+
+def remove_location(G, name, locations=None):
+    """Remove a building and its edges; only legs and caches that used it are invalidated."""
+    if name not in G:
+        raise KeyError(f"Location '{name}' not found")
+    old_signature = graph_signature(G)
+    old_pos = G.nodes[name].get('pos')
+    removed = list(G.edges(name, data='weight'))
+    G.remove_node(name)
+    if locations is not None:
+        locations.pop(name, None)
+    _commit_change(G, 'remove', name, old_pos, None, removed, [], old_signature)
+
 if __name__ == "__main__":
     # Test graph building
     G, locations = build_csuf_graph()
@@ -0,0 +1,185 @@
+import numpy as np
+
+class PointIndex:
+    """
+    Uniform grid over projected point coordinates. Points are sorted by cell so
+    a query only scans the handful of cells around the cursor.
+    """
+
+    def __init__(self, xs, ys, cell_size=50.0):
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        self.cell_size = float(cell_size)
+        self.min_x = self.xs.min() if len(self.xs) else 0.0
+        self.min_y = self.ys.min() if len(self.ys) else 0.0
+
+        cx, cy = self._cells(self.xs, self.ys)
+        self.order = np.lexsort((cy, cx))
+        self.cell_x = cx[self.order]
+        self.cell_y = cy[self.order]
+
+    def _slot(self, cx, cy):
+        # Position in the (cell_x, cell_y) order where a point in cell (cx, cy) belongs
+        lo = np.searchsorted(self.cell_x, cx, side='left')
+        hi = np.searchsorted(self.cell_x, cx, side='right')
+        return lo + np.searchsorted(self.cell_y[lo:hi], cy, side='right')
+
+    def _insert(self, i):
+        cx, cy = self._cells(self.xs[i], self.ys[i])
+        k = self._slot(cx, cy)
+        self.order = np.insert(self.order, k, i)
+        self.cell_x = np.insert(self.cell_x, k, cx)
+        self.cell_y = np.insert(self.cell_y, k, cy)
+
+    def _unlink(self, i):
+        k = int(np.flatnonzero(self.order == i)[0])
+        self.order = np.delete(self.order, k)
+        self.cell_x = np.delete(self.cell_x, k)
+        self.cell_y = np.delete(self.cell_y, k)
+
+    def add(self, x, y):
+        """Add a point with one sorted insert (the grid origin stays put); returns its index."""
+        self.xs = np.append(self.xs, float(x))
+        self.ys = np.append(self.ys, float(y))
+        i = len(self.xs) - 1
+        self._insert(i)
+        return i
+
+    def move(self, i, x, y):
+        """Move point i, re-slotting only its own grid entry."""
+        self._unlink(i)
+        self.xs[i] = x
+        self.ys[i] = y
+        self._insert(i)
+
+    def remove(self, i):
+        """Remove point i; later points shift down one index, like a list."""
+        self._unlink(i)
+        self.xs = np.delete(self.xs, i)
+        self.ys = np.delete(self.ys, i)
+        self.order[self.order > i] -= 1
+
+    def _cells(self, x, y):
+        cx = np.floor((np.asarray(x) - self.min_x) / self.cell_size).astype(np.int64)
+        cy = np.floor((np.asarray(y) - self.min_y) / self.cell_size).astype(np.int64)
+        return cx, cy
+
+    def nearest(self, x, y, radius):
+        """Index of the closest point within radius of (x, y), or None."""
+        if not len(self.xs):
+            return None
+        cx, cy = self._cells(x, y)
+        reach = int(np.ceil(radius / self.cell_size))
+
+        # Points are sorted by (cell_x, cell_y), so each column of cells is a contiguous run
+        candidates = []
+        for column in range(cx - reach, cx + reach + 1):
+            lo = np.searchsorted(self.cell_x, column, side='left')
+            hi = np.searchsorted(self.cell_x, column, side='right')
+            if lo == hi:
+                continue
+            start = lo + np.searchsorted(self.cell_y[lo:hi], cy - reach, side='left')
+            end = lo + np.searchsorted(self.cell_y[lo:hi], cy + reach, side='right')
+            if start < end:
+                candidates.append(self.order[start:end])
+        if not candidates:
+            return None
+
+        candidates = np.concatenate(candidates)
+        d2 = (self.xs[candidates] - x) ** 2 + (self.ys[candidates] - y) ** 2
+        best = int(np.argmin(d2))
+        if d2[best] > radius * radius:
+            return None
+        return int(candidates[best])
+
+class HoverPicker:
+    """
+    Hover/click labels for map points backed by a PointIndex. Motion events are
+    coalesced with a canvas timer, so at most one lookup runs per interval.
+    Keep a reference to the picker: matplotlib only holds weak references to
+    its callbacks.
+    """
+
+    def __init__(self, ax, xs, ys, names, tolerance_px=8, debounce_ms=30, on_click=None):
+        self.ax = ax
+        self.names = list(names)
+        self.index = PointIndex(xs, ys)
+        self.tolerance_px = tolerance_px
+        self.on_click = on_click
+        self._pending = None
+        self._current = None
+
+        self.annotation = ax.annotate("", xy=(0, 0), xytext=(15, 15), textcoords="offset points",
+                                      bbox=dict(boxstyle="round", fc="yellow", alpha=0.8),
+                                      arrowprops=dict(arrowstyle="->"))
+        self.annotation.set_visible(False)
+
+        canvas = ax.figure.canvas
+        self._timer = canvas.new_timer(interval=debounce_ms)
+        self._timer.single_shot = True
+        self._timer.add_callback(self._process_motion)
+        self._cids = [
+            canvas.mpl_connect('motion_notify_event', self._on_motion),
+            canvas.mpl_connect('button_press_event', self._on_press),
+        ]
+
+    def add_point(self, x, y, name):
+        self.index.add(x, y)
+        self.names.append(name)
+        self._show(None)
+
+    def move_point(self, i, x, y):
+        self.index.move(i, x, y)
+        self._current = None
+        self._show(None)
+
+    def remove_point(self, i):
+        self.index.remove(i)
+        del self.names[i]
+        self._current = None
+        self._show(None)
+
+    def disconnect(self):
+        for cid in self._cids:
+            self.ax.figure.canvas.mpl_disconnect(cid)
+        self._timer.stop()
+
+    def _radius(self, event):
+        # Convert the pixel tolerance to data units at the cursor position
+        inverse = self.ax.transData.inverted()
+        x0, _ = inverse.transform((event.x, event.y))
+        x1, _ = inverse.transform((event.x + self.tolerance_px, event.y))
+        return abs(x1 - x0)
+
+    def _pick(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            return None
+        return self.index.nearest(event.xdata, event.ydata, self._radius(event))
+
+    def _on_motion(self, event):
+        if self._pending is None:
+            self._timer.start()
+        self._pending = event
+
+    def _process_motion(self):
+        event, self._pending = self._pending, None
+        if event is not None:
+            self._show(self._pick(event))
+
+    def _on_press(self, event):
+        picked = self._pick(event)
+        self._show(picked)
+        if picked is not None and self.on_click:
+            self.on_click(picked, self.names[picked])
+
+    def _show(self, picked):
+        if picked == self._current:
+            return
+        self._current = picked
+        if picked is None:
+            self.annotation.set_visible(False)
+        else:
+            self.annotation.xy = (self.index.xs[picked], self.index.ys[picked])
+            self.annotation.set_text(self.names[picked])
+            self.annotation.set_visible(True)
+        self.ax.figure.canvas.draw_idle()
@@ -0,0 +1,153 @@
+import json
+
+CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+# Characters that can continue a number, so a number followed by them may be cut short
+_NUMBER_CHARS = '0123456789.eE+-'
+
+class _StreamReader:
+    """Buffered reader that decodes one JSON value at a time from a text file."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return
+        # Drop the consumed prefix so the buffer only holds unread text
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if self.eof:
+                return ''
+            self._fill()
+
+    def next_char(self):
+        c = self.peek()
+        self.pos += 1
+        return c
+
+    def expect(self, c):
+        found = self.next_char()
+        if found != c:
+            raise ValueError(f"Expected '{c}' but found '{found}' in JSON stream")
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self._fill()
+                continue
+            # A number running into the end of the buffer, or stopped by a '.', 'e' or
+            # sign that ends the buffer, may continue in the next chunk
+            buf = self.buf
+            if not self.eof and (end == len(buf) or buf[end] in _NUMBER_CHARS):
+                # Scan only the characters right after the value, never the whole rest of the buffer
+                tail = end
+                while tail < len(buf) and buf[tail] in _NUMBER_CHARS:
+                    tail += 1
+                if tail == len(buf):
+                    self._fill()
+                    continue
+            self.pos = end
+            return value
+
+def _walk(reader, keys, paths):
+    depth = len(keys)
+    c = reader.peek()
+
+    if c == '[' and any(len(p) == depth for p in paths):
+        # Target array: yield its elements one by one
+        reader.next_char()
+        if reader.peek() == ']':
+            reader.next_char()
+            return
+        while True:
+            yield keys, reader.decode()
+            c = reader.next_char()
+            if c == ']':
+                return
+            if c != ',':
+                raise ValueError(f"Unexpected '{c}' in JSON array")
+
+    elif c == '{' and any(len(p) > depth for p in paths):
+        reader.next_char()
+        if reader.peek() == '}':
+            reader.next_char()
+            return
+        while True:
+            key = reader.decode()
+            reader.expect(':')
+            matching = [p for p in paths if len(p) > depth and p[depth] in ('*', key)]
+            if matching:
+                yield from _walk(reader, keys + (key,), matching)
+            else:
+                reader.decode()
+            c = reader.next_char()
+            if c == '}':
+                return
+            if c != ',':
+                raise ValueError(f"Unexpected '{c}' in JSON object")
+
+    else:
+        # Value off the requested paths
+        reader.decode()
+
+def iter_json_arrays(f, paths, chunk_size=CHUNK_SIZE):
+    """
+    Stream the elements of the arrays found at the given key paths in a JSON
+    document without loading the whole document. A path is a tuple of object
+    keys ('*' matches any key; () is a top-level array). Yields (keys, element).
+    """
+    reader = _StreamReader(f, chunk_size)
+    yield from _walk(reader, (), [tuple(p) for p in paths])
+
+# Stream the elements of a single array, e.g. iter_json_array(f, ('elements',))
+def iter_json_array(f, path, chunk_size=CHUNK_SIZE):
+    for _, item in iter_json_arrays(f, [path], chunk_size):
+        yield item
+
+# Stream one JSON value per non-empty line
+def iter_jsonl(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+if __name__ == "__main__":
+    import io
+
+    class _SplitReader:
+        # Returns the text in two reads, split at a given offset
+        def __init__(self, text, split):
+            self.parts = [text[:split], text[split:]]
+
+        def read(self, size=-1):
+            return self.parts.pop(0) if self.parts else ''
+
+    # Chunk boundaries must not change the result, wherever they fall inside a number
+    doc = '{"version": 0.6, "elements": [33.8830939, 1e5, 2.5, -117.885, 1E-3, {"id": 12, "tags": {}}, true, "x"]}'
+    expected = json.loads(doc)['elements']
+    for split in range(1, len(doc) + 1):
+        assert list(iter_json_array(_SplitReader(doc, split), ('elements',))) == expected, split
+    for chunk_size in range(1, 8):
+        assert list(iter_json_array(io.StringIO(doc), ('elements',), chunk_size)) == expected, chunk_size
+    print(f"Stream decoding matched json.loads at all {len(doc)} split offsets")
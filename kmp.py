@@ -1,8 +1,6 @@
-import json
+from data_loader import get_data
 
-with open('tasks.json', 'r') as f:
-    tasks_data = json.load(f)
-    tasks_list = tasks_data['tasks']
+tasks_list = get_data().tasks
 
 def kmp_search(text, pattern):
     def compute_lps(pattern):
@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict, namedtuple
+import numpy as np
+import routing
+from graph_utils import graph_signature, haversine_np
+
+# Spherical Web Mercator (EPSG:3857), the projection of the basemap tiles
+EARTH_RADIUS_M = 6378137.0
+
+# One leg of a route: node path (None if unreachable) and length in meters
+Leg = namedtuple('Leg', ['path', 'distance'])
+
+def lonlat_to_mercator(lons, lats):
+    """Project longitude/latitude (scalars or sequences) to Web Mercator x/y."""
+    lons = np.radians(np.asarray(lons, dtype=float))
+    lats = np.radians(np.asarray(lats, dtype=float))
+    return EARTH_RADIUS_M * lons, EARTH_RADIUS_M * np.log(np.tan(np.pi / 4 + lats / 2))
+
+class LegCache:
+    """
+    Per-graph cache of route legs keyed by ordered (from, to) building pair.
+    Legs are computed lazily and kept in an LRU bounded by max_legs; a
+    multi-leg route is then assembled by concatenating cached legs.
+    In-place location changes are followed by apply_change(); any other
+    change to the graph's signature clears the cache.
+    """
+
+    def __init__(self, G, max_legs=4096):
+        self.G = G
+        self.max_legs = max_legs
+        self._legs = OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = None
+        self._refresh()
+
+    def _refresh(self):
+        # Projected coordinates of every node, looked up by index
+        self.nodes = list(self.G.nodes())
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        positions = [self.G.nodes[node].get('pos', (np.nan, np.nan)) for node in self.nodes]
+        self.node_lon = np.array([p[0] for p in positions], dtype=float)
+        self.node_lat = np.array([p[1] for p in positions], dtype=float)
+        self.node_x, self.node_y = lonlat_to_mercator(self.node_lon, self.node_lat)
+        self._legs.clear()
+        # node -> keys of the cached legs whose path visits it
+        self._through = {}
+        self._signature = graph_signature(self.G)
+
+    def _check_graph(self):
+        if graph_signature(self.G) != self._signature:
+            self._refresh()
+
+    def __len__(self):
+        return len(self._legs)
+
+    def _store(self, key, leg):
+        self._legs[key] = leg
+        for node in leg.path or key:
+            self._through.setdefault(node, set()).add(key)
+
+    def _forget(self, key):
+        leg = self._legs.pop(key)
+        for node in leg.path or key:
+            keys = self._through.get(node)
+            if keys is not None:
+                keys.discard(key)
+
+    def project(self, nodes):
+        """Projected x/y arrays for a sequence of nodes."""
+        with self._lock:
+            self._check_graph()
+            index = np.fromiter((self.node_index[n] for n in nodes), dtype=np.int64, count=len(nodes))
+            return self.node_x[index], self.node_y[index]
+
+    def leg(self, start, end):
+        with self._lock:
+            self._check_graph()
+            key = (start, end)
+            if key in self._legs:
+                self._legs.move_to_end(key)
+                return self._legs[key]
+
+        path, distance = routing.shortest_path_with_distance(self.G, start, end)
+        leg = Leg(path, distance)
+
+        with self._lock:
+            self._store(key, leg)
+            while len(self._legs) > self.max_legs:
+                self._forget(next(iter(self._legs)))
+        return leg
+
+    def apply_change(self, change):
+        """
+        Follow an in-place routing.GraphChange without clearing everything.
+        Legs whose path visits the changed node are dropped. A new or moved
+        node can only shorten a leg a -> b if the great-circle distance
+        a -> node -> b is below the leg's length (no walk beats the great
+        circle), so only those legs, and unreachable ones, are dropped too.
+        """
+        with self._lock:
+            if self._signature != change.old_signature:
+                # Missed an earlier change, fall back to a full refresh
+                self._refresh()
+                return
+
+            node = change.node
+            if change.kind == 'add':
+                self.node_index[node] = len(self.nodes)
+                self.nodes.append(node)
+                self.node_lon = np.append(self.node_lon, np.nan)
+                self.node_lat = np.append(self.node_lat, np.nan)
+                self.node_x = np.append(self.node_x, np.nan)
+                self.node_y = np.append(self.node_y, np.nan)
+            if change.kind in ('add', 'move'):
+                i = self.node_index[node]
+                self.node_lon[i], self.node_lat[i] = change.new_pos
+                x, y = lonlat_to_mercator(change.new_pos[0], change.new_pos[1])
+                self.node_x[i], self.node_y[i] = float(x), float(y)
+
+            for key in list(self._through.get(node, ())):
+                self._forget(key)
+            if change.kind == 'remove':
+                self._through.pop(node, None)
+                del self.node_index[node]
+            else:
+                self._drop_shortcut_legs(change.new_pos)
+
+            self._signature = graph_signature(self.G)
+
+    def _drop_shortcut_legs(self, pos):
+        # Drop legs that a detour via pos might now beat
+        if not self._legs:
+            return
+        keys = list(self._legs)
+        starts = np.fromiter((self.node_index.get(a, -1) for a, _ in keys), dtype=np.int64, count=len(keys))
+        ends = np.fromiter((self.node_index.get(b, -1) for _, b in keys), dtype=np.int64, count=len(keys))
+        lengths = np.fromiter((self._legs[key].distance for key in keys), dtype=float, count=len(keys))
+        lon, lat = pos
+        via = (haversine_np(self.node_lat[starts], self.node_lon[starts], lat, lon)
+               + haversine_np(lat, lon, self.node_lat[ends], self.node_lon[ends]))
+        # NaN bounds (nodes without a position) compare False, so those legs go too
+        stale = ~(via * (1 - 1e-6) >= lengths)
+        for k in np.flatnonzero(stale):
+            self._forget(keys[k])
+
+    def precompute(self, buildings=None):
+        """Fill the cache for every ordered pair of the given buildings (default: all nodes)."""
+        buildings = list(self.G.nodes()) if buildings is None else list(buildings)
+        self.max_legs = max(self.max_legs, len(buildings) * (len(buildings) - 1))
+        for start in buildings:
+            for end in buildings:
+                if start != end:
+                    self.leg(start, end)
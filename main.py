@@ -1,19 +1,30 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import json
-import networkx as nx
+import os
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib._pylab_helpers import Gcf
 import datetime
-import math
 import heapq
+import numpy as np
 from datetime import datetime as dt
 import contextily as ctx
 import geopandas as gpd
 import pandas as pd
 from pyproj import Transformer
-import mplcursors
+from data_loader import get_data, save_tasks
+from graph_builder import build_csuf_graph, add_location, move_location, remove_location
+from leg_cache import lonlat_to_mercator
 from kmp import kmp_search, search_tasks_by_building
+from routing import get_leg_cache, cached_structures
+from solver import parse_time
+from solution_cache import SolutionCache, cached_optimize_route
+from background import BackgroundWorker
+from hover import HoverPicker
+from memory_report import MemoryTracker, figure_sizeof
+from autocomplete import PrefixIndex, ComboboxAutocomplete
+from virtual_list import ListModel, VirtualListView
 
 # Set theme colors
 BG_COLOR = "#ffffff"
@@ -59,222 +70,56 @@ def configure_styles():
                    fieldbackground=PANEL_BG,
                    selectbackground=ACCENT_COLOR)
 
-# Load data from JSON files
-with open('csuf_locations.json', 'r') as f:
-    csuf_locations = json.load(f)
+# Load locations, tasks and weekly schedule (shared with the other tools)
+campus_data = get_data()
+csuf_locations = campus_data.locations
+tasks_data = campus_data.tasks_data
+tasks_list = campus_data.tasks
+weekly_schedule = campus_data.weekly_schedule
 
-with open('tasks.json', 'r') as f:
-    tasks_data = json.load(f)
-    tasks_list = tasks_data['tasks']
+# Display string for a task in the comboboxes and lists
+def task_label(task):
+    return f"{task['task_name']} ({task['building_name']}, {task['time_start']}-{task['time_finish']}, {task['priority']})"
 
-# Load weekly schedule
-with open('weekly_tasks.json', 'r') as f:
-    weekly_data = json.load(f)
-    weekly_schedule = weekly_data['weekly_schedule']
-
-# Function to calculate distance between two coordinates (using Haversine formula)
-def calculate_distance(lat1, lon1, lat2, lon2):
-    # Earth radius in kilometers
-    R = 6371.0
-    
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-    
-    dlon = lon2_rad - lon1_rad
-    dlat = lat2_rad - lat1_rad
-    
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    
-    distance = R * c
-    
-    # Convert to meters
-    return distance * 1000
-
-# Build graph of CSUF campus
-def build_csuf_graph():
-    G = nx.Graph()
-    
-    # Add nodes for each building
-    for building, coords in csuf_locations.items():
-        lat, lon = coords
-        G.add_node(building, pos=(lon, lat))
-    
-    # Connect buildings with edges (fully connected graph)
-    buildings = list(csuf_locations.keys())
-    for i in range(len(buildings)):
-        for j in range(i+1, len(buildings)):
-            building1 = buildings[i]
-            building2 = buildings[j]
-            lat1, lon1 = csuf_locations[building1]
-            lat2, lon2 = csuf_locations[building2]
-            
-            # Calculate distance between buildings
-            distance = calculate_distance(lat1, lon1, lat2, lon2)
-            
-            # Add edge with distance as weight
-            G.add_edge(building1, building2, weight=distance)
-    
-    return G
-
-# Find shortest path between buildings using Dijkstra's algorithm
-def find_shortest_path(G, start_building, end_building):
-    try:
-        path = nx.shortest_path(G, source=start_building, target=end_building, weight='weight')
-        return path
-    except nx.NetworkXNoPath:
-        return None
-
-# Parse time string to datetime object
-def parse_time(time_str):
-    return dt.strptime(time_str, "%H:%M").time()
-
-# Check if two tasks overlap
-def tasks_overlap(task1, task2):
-    task1_start = parse_time(task1['time_start'])
-    task1_end = parse_time(task1['time_finish'])
-    task2_start = parse_time(task2['time_start'])
-    task2_end = parse_time(task2['time_finish'])
-    
-    # Check if task2 starts before task1 ends and task2 ends after task1 starts
-    return (task2_start < task1_end) and (task2_end > task1_start)
-
-# Calculate travel time between buildings (in minutes)
-def calculate_travel_time(G, building1, building2):
-    try:
-        path = nx.shortest_path(G, source=building1, target=building2, weight='weight')
-        distance = sum(G[path[i]][path[i+1]]['weight'] for i in range(len(path)-1))
-        # Assuming average walking speed of 1.4 m/s (5 km/h)
-        travel_time_minutes = (distance / 1.4) / 60
-        return travel_time_minutes
-    except nx.NetworkXNoPath:
-        return float('inf')
-
-# Sort tasks by priority and resolve time conflicts
-def optimize_schedule(tasks):
-    # Define priority values
-    priority_values = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
-    
-    # Sort tasks by priority (higher priority first) and then by start time
-    sorted_tasks = sorted(
-        tasks, 
-        key=lambda x: (
-            -priority_values.get(x['priority'], 0),  # Negative to sort in descending order
-            parse_time(x['time_start'])
-        )
-    )
-    
-    optimized_schedule = []
-    
-    for task in sorted_tasks:
-        # Check if current task overlaps with any task in the optimized schedule
-        overlaps = False
-        for scheduled_task in optimized_schedule:
-            if tasks_overlap(task, scheduled_task):
-                overlaps = True
-                # If there's an overlap, keep the task with higher priority
-                if priority_values.get(task['priority'], 0) > priority_values.get(scheduled_task['priority'], 0):
-                    optimized_schedule.remove(scheduled_task)
-                    optimized_schedule.append(task)
-                break
-        
-        # If no overlap or resolved overlap, add task to schedule
-        if not overlaps:
-            optimized_schedule.append(task)
-    
-    # Sort optimized schedule by start time
-    optimized_schedule = sorted(optimized_schedule, key=lambda x: parse_time(x['time_start']))
-    
-    return optimized_schedule
-
-# Find the optimal route between buildings for a given schedule
-def find_optimal_route(G, schedule):
-    if not schedule:
-        return [], 0
-    
-    route = []
-    total_distance = 0
-    buildings = [task['building_name'] for task in schedule]
-    
-    # Start from the first building
-    current_building = buildings[0]
-    route.append(current_building)
-    
-    # Find shortest path to each subsequent building
-    for next_building in buildings[1:]:
-        if current_building != next_building:
-            path = find_shortest_path(G, current_building, next_building)
-            if path:
-                # Calculate distance for this segment
-                for i in range(len(path) - 1):
-                    total_distance += G[path[i]][path[i+1]]['weight']
-                # Add intermediate buildings to route (excluding the starting point which is already in the route)
-                route.extend(path[1:])
-            else:
-                # If no path found, just add the destination
-                route.append(next_building)
-        
-        current_building = next_building
-    
-    return route, total_distance
+# Multi-line entry for a task in the optimized schedule
+def schedule_row(index, task):
+    return (f"{index + 1}. {task['task_name']}\n"
+            f"   Location: {task['building_name']}\n"
+            f"   Time: {task['time_start']} - {task['time_finish']}\n"
+            f"   Priority: {task['priority']}")
 
 # Plot the route on the map
 def plot_route(G, route, csuf_locations):
-    # Create a figure and axis
-    fig, ax = plt.subplots(figsize=(12, 10))
-    
-    # Prepare data for GeoDataFrame
-    names = []
-    latitudes = []
-    longitudes = []
-    
-    for name, (lat, lon) in csuf_locations.items():
-        names.append(name)
-        latitudes.append(lat)
-        longitudes.append(lon)
-    
-    df = pd.DataFrame({'name': names, 'lat': latitudes, 'lon': longitudes})
-    gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df['lon'], df['lat']), crs="EPSG:4326")
+    # Create a figure and axis (without pyplot, so this is safe on a worker thread)
+    fig = Figure(figsize=(12, 10))
+    ax = fig.add_subplot()
     
-    # Reproject to Web Mercator (meters)
-    gdf = gdf.to_crs(epsg=3857)
+    # Web Mercator (meters) coordinates come from the graph's cached node
+    # positions, so redraws don't rebuild and reproject a GeoDataFrame
+    legs = get_leg_cache(G)
     
     # Plot all buildings
-    gdf.plot(ax=ax, color='gray', markersize=5)
+    building_x, building_y = legs.project([name for name in csuf_locations if name in G])
+    ax.scatter(building_x, building_y, color='gray', s=5)
     
     # Plot route
     if route:
-        route_points = []
-        route_names = []
-        
-        for building in route:
-            lat, lon = csuf_locations[building]
-            route_points.append((lon, lat))
-            route_names.append(building)
-        
-        route_df = pd.DataFrame({'name': route_names, 'lon': [p[0] for p in route_points], 'lat': [p[1] for p in route_points]})
-        route_gdf = gpd.GeoDataFrame(route_df, geometry=gpd.points_from_xy(route_df['lon'], route_df['lat']), crs="EPSG:4326")
-        route_gdf = route_gdf.to_crs(epsg=3857)
+        route_x, route_y = legs.project(route)
         
         # Plot route points
-        route_gdf.plot(ax=ax, color='red', markersize=8)
+        ax.scatter(route_x, route_y, color='red', s=8)
         
-        # Draw lines connecting route points
-        for i in range(len(route_gdf) - 1):
-            x1, y1 = route_gdf.geometry.iloc[i].x, route_gdf.geometry.iloc[i].y
-            x2, y2 = route_gdf.geometry.iloc[i+1].x, route_gdf.geometry.iloc[i+1].y
-            ax.plot([x1, x2], [y1, y2], 'r-', linewidth=2)
+        # Draw the whole route as a single polyline
+        ax.plot(route_x, route_y, 'r-', linewidth=2)
         
         # Add labels for buildings in the route
-        for i, (x, y, label) in enumerate(zip(route_gdf.geometry.x, route_gdf.geometry.y, route_gdf['name'])):
+        for i, (x, y, label) in enumerate(zip(route_x, route_y, route)):
             ax.text(x + 10, y + 10, f"{i+1}. {label}", fontsize=8, weight='bold', color='black')
     
     # Add basemap
-    ctx.add_basemap(ax, crs=gdf.crs.to_string(), source=ctx.providers.OpenStreetMap.Mapnik)
+    ctx.add_basemap(ax, crs="EPSG:3857", source=ctx.providers.OpenStreetMap.Mapnik)
     
-    plt.title("CSUF Optimized Route")
+    ax.set_title("CSUF Optimized Route")
     
     # Add lat/lon display
     transformer = Transformer.from_crs("EPSG:3857", "EPSG:4326", always_xy=True)
@@ -299,14 +144,33 @@ class CSUFScheduleApp:
         configure_styles()
         
         # Build CSUF graph
-        self.G = build_csuf_graph()
+        self.G, _ = build_csuf_graph()
         
         # Initialize schedule and selected tasks
         self.schedule = []
-        self.selected_tasks = []
+        self.selected_tasks = ListModel(key=task_label)  # Keyed by label, so duplicates are an O(1) check
+        self.schedule_rows = ListModel()
         self.selected_building = None  # Track validated building
         self.task_controls = []  # Track buttons and widgets related to tasks
         self.selected_day = tk.StringVar(value="Monday")  # Default to Monday
+        self.solve_worker = None  # Background optimization in progress
+        self.solve_generation = 0  # Bumped per solve and day change; stale results are dropped
+        self.map_hover = None  # Hover labels for the current map
+        self.map_points = None  # Building markers of the initial map, updated in place on location edits
+        self.map_figure = None  # pyplot figure behind the initial map, closed when the map is replaced
+        
+        # Reuse solutions for task sets solved before; set GEOPATH_SOLUTION_CACHE_DIR to keep them on disk
+        self.solution_cache = SolutionCache(disk_dir=os.environ.get("GEOPATH_SOLUTION_CACHE_DIR"))
+        
+        # Memory accounting; set GEOPATH_MEMORY_REPORT to trace allocations and print a report at exit
+        self.memory = MemoryTracker(trace=bool(os.environ.get("GEOPATH_MEMORY_REPORT")))
+        self.register_memory_subsystems()
+        
+        # Prefix indexes behind the task and building autocomplete
+        self.task_index = PrefixIndex((task['task_name'], task) for task in tasks_list)
+        self.building_index = PrefixIndex((name, name) for name in csuf_locations)
+        if os.environ.get("GEOPATH_MEMORY_REPORT"):
+            self.memory.install_atexit()
 
         # Create GUI elements
         self.create_widgets()
@@ -326,22 +190,21 @@ class CSUFScheduleApp:
         
         ttk.Label(day_frame, text="Select Day:", style='Header.TLabel').pack(side=tk.LEFT, padx=5)
         days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        day_combo = ttk.Combobox(day_frame, textvariable=self.selected_day, values=days, state="readonly", width=15)
-        day_combo.pack(side=tk.LEFT, padx=5)
-        day_combo.bind('<<ComboboxSelected>>', self.load_day_tasks)
+        self.day_combo = ttk.Combobox(day_frame, textvariable=self.selected_day, values=days, state="readonly", width=15)
+        self.day_combo.pack(side=tk.LEFT, padx=5)
+        self.day_combo.bind('<<ComboboxSelected>>', self.load_day_tasks)
         
         # Task selection combobox
         ttk.Label(left_panel, text="Select Task:", style='Header.TLabel').pack(anchor=tk.W, pady=(0, 5))
         self.task_combobox = ttk.Combobox(left_panel, width=50)
         self.task_combobox.pack(fill=tk.X, pady=(0, 15))
-        self.update_task_combobox()
         self.task_controls.append(self.task_combobox)
         
         # Enable task combobox by default
         self.task_combobox.configure(state='normal')
         
-        # Populate combobox with task names
-        self.update_task_combobox()
+        # Suggest matching tasks as the user types
+        self.task_autocomplete = ComboboxAutocomplete(self.task_combobox, self.task_index, format=task_label)
         
         # Buttons for task management
         button_frame = ttk.Frame(left_panel, style='Main.TFrame')
@@ -359,6 +222,15 @@ class CSUFScheduleApp:
         clear_button = ttk.Button(button_frame, text="Clear All Tasks", command=self.clear_tasks, style='Action.TButton')
         clear_button.pack(side=tk.LEFT, padx=6)
         self.task_controls.append(clear_button)
+        location_button = ttk.Button(button_frame, text="Add Location", command=self.create_new_location, style='Action.TButton')
+        location_button.pack(side=tk.LEFT, padx=6)
+        self.task_controls.append(location_button)
+        move_location_button = ttk.Button(button_frame, text="Move Location", command=self.move_existing_location, style='Action.TButton')
+        move_location_button.pack(side=tk.LEFT, padx=6)
+        self.task_controls.append(move_location_button)
+        remove_location_button = ttk.Button(button_frame, text="Remove Location", command=self.remove_existing_location, style='Action.TButton')
+        remove_location_button.pack(side=tk.LEFT, padx=6)
+        self.task_controls.append(remove_location_button)
 
         # Search bar for buildings
         ttk.Label(left_panel, text="Search Building:", style='Header.TLabel').pack(anchor=tk.W, pady=(10, 5))
@@ -379,23 +251,37 @@ class CSUFScheduleApp:
         listbox_frame = ttk.Frame(left_panel, style='Main.TFrame')
         listbox_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
-        self.selected_tasks_listbox = tk.Listbox(listbox_frame, 
-                                               height=8, 
-                                               width=70,
-                                               bg=PANEL_BG,
-                                               fg=TEXT_COLOR,
-                                               selectbackground=ACCENT_COLOR,
-                                               selectforeground=BUTTON_FG,
-                                               font=('Helvetica', 9))
+        self.selected_tasks_listbox = VirtualListView(listbox_frame,
+                                                      self.selected_tasks,
+                                                      lambda index, task: task_label(task),
+                                                      height=8,
+                                                      width=70,
+                                                      bg=PANEL_BG,
+                                                      fg=TEXT_COLOR,
+                                                      select_bg=ACCENT_COLOR,
+                                                      select_fg=BUTTON_FG,
+                                                      font=('Helvetica', 9))
         self.selected_tasks_listbox.pack(fill=tk.BOTH, expand=True)
         
         # Schedule optimization and route finding
         optimize_button = ttk.Button(left_panel, 
                   text="Optimize Schedule and Find Route",
                   command=self.optimize_and_find_route,
-                  style='Action.TButton').pack(fill=tk.X, pady=15)
+                  style='Action.TButton')
+        optimize_button.pack(fill=tk.X, pady=15)
         self.task_controls.append(optimize_button)
         
+        # Progress of a running optimization, with a button to abort it
+        progress_frame = ttk.Frame(left_panel, style='Main.TFrame')
+        progress_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=1.0)
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.cancel_button = ttk.Button(progress_frame, text="Cancel", command=self.cancel_optimization,
+                                        style='Action.TButton', state='disabled')
+        self.cancel_button.pack(side=tk.LEFT, padx=6)
+        
         # Schedule display
         ttk.Label(left_panel, text="Optimized Schedule:", style='Header.TLabel').pack(anchor=tk.W, pady=(15, 5))
         
@@ -403,12 +289,17 @@ class CSUFScheduleApp:
         schedule_frame = ttk.Frame(left_panel, style='Main.TFrame')
         schedule_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
-        self.schedule_text = tk.Text(schedule_frame,
-                                   height=8,
-                                   width=70,
-                                   bg=PANEL_BG,
-                                   fg=TEXT_COLOR,
-                                   font=('Helvetica', 9))
+        self.schedule_text = VirtualListView(schedule_frame,
+                                             self.schedule_rows,
+                                             schedule_row,
+                                             lines_per_row=4,
+                                             height=8,
+                                             width=70,
+                                             bg=PANEL_BG,
+                                             fg=TEXT_COLOR,
+                                             select_bg=ACCENT_COLOR,
+                                             select_fg=BUTTON_FG,
+                                             font=('Helvetica', 9))
         self.schedule_text.pack(fill=tk.BOTH, expand=True)
         
         # Route information display
@@ -426,6 +317,10 @@ class CSUFScheduleApp:
                                      font=('Helvetica', 9))
         self.route_info_text.pack(fill=tk.X)
         
+        memory_button = ttk.Button(left_panel, text="Memory Report", command=self.show_memory_report, style='Action.TButton')
+        memory_button.pack(anchor=tk.E)
+        self.task_controls.append(memory_button)
+        
         # Canvas for map display
         self.canvas_frame = ttk.Frame(main_frame, style='Main.TFrame')
         self.canvas_frame.pack(fill=tk.BOTH, expand=True)
@@ -433,11 +328,38 @@ class CSUFScheduleApp:
         # Show initial map
         self.show_initial_map()
 
+    def register_memory_subsystems(self):
+        G = self.G
+        self.memory.register("graph", lambda: [G])
+        self.memory.register("task catalog", lambda: [campus_data, self.selected_tasks, self.schedule])
+        self.memory.register("search indexes", lambda: [cached_structures(G)[0], self.task_index, self.building_index,
+                                                        self.map_hover.index if self.map_hover else None])
+        # Figures still registered with pyplot plus the one on screen
+        # (listed through Gcf, since plt.figure(n) would make each one current)
+        self.memory.register("figures", lambda: [manager.canvas.figure for manager in Gcf.get_all_fig_managers()] +
+                             [self.canvas.figure if hasattr(self, 'canvas') else None],
+                             sizer=figure_sizeof)
+        self.memory.register("caches", lambda: [self.solution_cache, cached_structures(G)[1]])
+
+    def show_memory_report(self):
+        window = tk.Toplevel(self.root)
+        window.title("Memory Report")
+        report_text = tk.Text(window, width=90, height=40, bg=PANEL_BG, fg=TEXT_COLOR, font=('Courier', 9))
+        report_text.pack(fill=tk.BOTH, expand=True)
+        report_text.insert(tk.END, self.memory.format_report())
+        report_text.configure(state='disabled')
+
     def disable_task_controls(self):
         for widget in self.task_controls:
             widget.configure(state='disabled')
 
+    def solving(self):
+        return self.solve_worker is not None and self.solve_worker.running
+
     def enable_task_controls(self):
+        # The solve thread reads self.G and the task list, so keep them locked until it finishes
+        if self.solving():
+            return
         for widget in self.task_controls:
             if isinstance(widget, (tk.Button, tk.Entry, tk.Text, tk.Checkbutton, tk.Radiobutton, ttk.Button, ttk.Entry, ttk.Checkbutton, ttk.Radiobutton)):
                 widget.configure(state='normal')
@@ -448,28 +370,28 @@ class CSUFScheduleApp:
             messagebox.showinfo("Information", "Please select a task first")
             return
     
-        # Find the task that matches the selected text
-        selected_task = None
-        for task in tasks_list:
-            task_str = f"{task['task_name']} ({task['building_name']}, {task['time_start']}-{task['time_finish']}, {task['priority']})"
-            if task_str == selected_text:
-                selected_task = task
-                break
+        # Find the task behind the selected suggestion
+        selected_task = self.task_autocomplete.selected()
         
         if selected_task:
-            # Check if task is already selected
-            task_str = f"{selected_task['task_name']} ({selected_task['building_name']}, {selected_task['time_start']}-{selected_task['time_finish']}, {selected_task['priority']})"
-            if task_str not in self.selected_tasks_listbox.get(0, tk.END):
-                self.selected_tasks.append(selected_task)
-                self.selected_tasks_listbox.insert(tk.END, task_str)
+            # Add unless it is already selected
+            if self.selected_tasks.add(selected_task):
                 # Clear the combobox selection
                 self.task_combobox.set('')
         else:
             messagebox.showinfo("Information", "Please select a valid task from the dropdown")
     
+    def close_map_figure(self):
+        # pyplot keeps every figure it creates until it is closed
+        if self.map_figure is not None:
+            plt.close(self.map_figure)
+            self.map_figure = None
+
     def show_initial_map(self):
-        # Create initial map with all buildings
+        # Create initial map with all buildings, replacing the previous one
+        self.close_map_figure()
         fig, ax = plt.subplots(figsize=(12, 10))  # Consistent size with plot_route
+        self.map_figure = fig
         
         # Prepare data for GeoDataFrame
         names = []
@@ -485,8 +407,8 @@ class CSUFScheduleApp:
         gdf = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df['lon'], df['lat']), crs="EPSG:4326")
         gdf = gdf.to_crs(epsg=3857)
         
-        # Plot all buildings
-        gdf.plot(ax=ax, color='red', markersize=6)
+        # Plot all buildings, keeping the markers so location edits can update them in place
+        self.map_points = ax.scatter(gdf.geometry.x, gdf.geometry.y, color='red', s=6)
         
         # Add building labels for important buildings
         important_buildings = list()  # Include all buildings
@@ -497,7 +419,7 @@ class CSUFScheduleApp:
         # Add basemap
         ctx.add_basemap(ax, crs=gdf.crs.to_string(), source=ctx.providers.OpenStreetMap.Mapnik)
         
-        plt.title("CSUF Campus Map")
+        ax.set_title("CSUF Campus Map")
         
         # Add coordinate display
         transformer = Transformer.from_crs("EPSG:3857", "EPSG:4326", always_xy=True)
@@ -508,28 +430,18 @@ class CSUFScheduleApp:
         
         ax.format_coord = format_coord
         
-        # Add hover functionality
-        cursor = mplcursors.cursor(ax.collections[0], hover=True)
-        
-        @cursor.connect("add")
-        def on_add(sel):
-            sel.annotation.set_text(gdf.iloc[sel.index]['name'])
-            sel.annotation.get_bbox_patch().set(fc="yellow", alpha=0.8)
-        
         # Update canvas
         if hasattr(self, 'canvas'):
             self.canvas_widget.destroy()
+        if self.map_hover:
+            self.map_hover.disconnect()
         
         self.canvas = FigureCanvasTkAgg(fig, master=self.canvas_frame)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(fill=tk.BOTH, expand=True)
-    
-    def update_task_combobox(self):
-        # Sort tasks by name for better display
-        sorted_tasks = sorted(tasks_list, key=lambda x: x['task_name'])
-        task_names = [f"{t['task_name']} ({t['building_name']}, {t['time_start']}-{t['time_finish']}, {t['priority']})" 
-                      for t in sorted_tasks]
-        self.task_combobox['values'] = task_names
+        
+        # Add hover functionality (after the Tk canvas exists, since it drives the debounce timer)
+        self.map_hover = HoverPicker(ax, gdf.geometry.x.to_numpy(), gdf.geometry.y.to_numpy(), gdf['name'].to_numpy())
     
     def create_new_task(self):
         # Create a new window for task creation
@@ -550,8 +462,8 @@ class CSUFScheduleApp:
         # Building selection
         ttk.Label(main_frame, text="Building:", style='Header.TLabel').grid(row=1, column=0, sticky=tk.W, padx=5, pady=5)
         building_combobox = ttk.Combobox(main_frame, width=30)
-        building_combobox['values'] = sorted(list(csuf_locations.keys()))
         building_combobox.grid(row=1, column=1, padx=5, pady=5)
+        ComboboxAutocomplete(building_combobox, self.building_index)
     
         # Start time
         ttk.Label(main_frame, text="Start Time (HH:MM):", style='Header.TLabel').grid(row=2, column=0, sticky=tk.W, padx=5, pady=5)
@@ -607,18 +519,15 @@ class CSUFScheduleApp:
             # Add to tasks list
             tasks_list.append(new_task)
         
-            # Update the combobox
-            self.update_task_combobox()
+            # Update the autocomplete index
+            self.task_index.add(task_name, new_task)
+            self.task_autocomplete.refresh()
         
             # Add to selected tasks
-            self.selected_tasks.append(new_task)
-            task_str = f"{task_name} ({building}, {start_time}-{end_time}, {priority})"
-            self.selected_tasks_listbox.insert(tk.END, task_str)
+            self.selected_tasks.add(new_task)
         
             # Save to tasks.json file
-            tasks_data['tasks'] = tasks_list
-            with open('tasks.json', 'w') as f:
-                json.dump(tasks_data, f, indent=2)
+            save_tasks(campus_data)
         
             # Close window
             task_window.destroy()
@@ -628,212 +537,191 @@ class CSUFScheduleApp:
                   command=save_task,
                   style='Action.TButton').grid(row=5, column=0, columnspan=2, pady=20)
 
+    def create_new_location(self):
+        # Temporary locations (event tents, detours) are added to the live graph only, not saved
+        if self.solving():
+            return
+        name = simpledialog.askstring("Add Location", "Location name:", parent=self.root)
+        if not name or not name.strip():
+            return
+        lat = simpledialog.askfloat("Add Location", "Latitude:", parent=self.root)
+        lon = simpledialog.askfloat("Add Location", "Longitude:", parent=self.root)
+        if lat is None or lon is None:
+            return
+        
+        name = name.strip()
+        try:
+            add_location(self.G, name, lat, lon, csuf_locations)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        self.building_index.add(name, name)
+        self.update_map_point(name)
+
+    def ask_existing_location(self, title):
+        # Location name for a move/remove, defaulting to the last building found by search
+        name = simpledialog.askstring(title, "Location name:", initialvalue=self.selected_building or "",
+                                      parent=self.root)
+        if not name or not name.strip():
+            return None
+        name = name.strip()
+        if name not in self.G:
+            messagebox.showerror("Error", f"Location '{name}' not found")
+            return None
+        return name
+
+    def move_existing_location(self):
+        if self.solving():
+            return
+        name = self.ask_existing_location("Move Location")
+        if name is None:
+            return
+        old_lat, old_lon = csuf_locations[name]
+        lat = simpledialog.askfloat("Move Location", "Latitude:", initialvalue=old_lat, parent=self.root)
+        lon = simpledialog.askfloat("Move Location", "Longitude:", initialvalue=old_lon, parent=self.root)
+        if lat is None or lon is None:
+            return
+        
+        move_location(self.G, name, lat, lon, csuf_locations)
+        self.update_map_point(name)
+
+    def remove_existing_location(self):
+        if self.solving():
+            return
+        name = self.ask_existing_location("Remove Location")
+        if name is None:
+            return
+        if any(task['building_name'] == name for task in self.selected_tasks):
+            messagebox.showerror("Error", f"Remove the selected tasks at '{name}' first")
+            return
+        if not messagebox.askyesno("Remove Location", f"Remove '{name}' from the campus graph?"):
+            return
+        
+        remove_location(self.G, name, csuf_locations)
+        self.building_index.remove(name, name)
+        if self.selected_building == name:
+            self.selected_building = None
+        self.update_map_point(name)
+
+    def update_map_point(self, name):
+        """
+        Reflect an added, moved or removed location on the initial map by
+        editing its marker offsets and hover index in place. A route map is
+        left alone; it picks the change up on its next redraw.
+        """
+        if self.map_points is None or self.map_hover is None:
+            return
+        names = self.map_hover.names
+        offsets = self.map_points.get_offsets()
+        if name in csuf_locations:
+            lat, lon = csuf_locations[name]
+            x, y = lonlat_to_mercator(lon, lat)
+            if name in names:
+                i = names.index(name)
+                self.map_hover.move_point(i, float(x), float(y))
+                offsets[i] = (x, y)
+            else:
+                self.map_hover.add_point(float(x), float(y), name)
+                offsets = np.vstack([offsets, [(x, y)]])
+        elif name in names:
+            i = names.index(name)
+            self.map_hover.remove_point(i)
+            offsets = np.delete(offsets, i, axis=0)
+        self.map_points.set_offsets(offsets)
+        self.canvas.draw_idle()
+
     def remove_task(self):
         selected_index = self.selected_tasks_listbox.curselection()
         if selected_index:
             self.selected_tasks.pop(selected_index[0])
-            self.selected_tasks_listbox.delete(selected_index[0])
 
     def clear_tasks(self):
-        self.selected_tasks = []
-        self.selected_tasks_listbox.delete(0, tk.END)
+        self.selected_tasks.clear()
         self.schedule = []
-        self.schedule_text.delete(1.0, tk.END)
+        self.schedule_rows.clear()
     
     def optimize_and_find_route(self):
         if not self.selected_tasks:
             messagebox.showinfo("Information", "No tasks selected")
             return
         
-        # Step 1: Group tasks by time slot and priority
-        task_groups = {}
-        for task in self.selected_tasks:
-            key = (task['priority'], task['time_start'], task['time_finish'])
-            if key not in task_groups:
-                task_groups[key] = []
-            task_groups[key].append(task)
-        
-        # Early pruning optimization:
-        # If there are many groups, process them in chronological order
-        # and prune combinations that are already worse than the best found
-        
-        # Sort groups by time for early pruning
-        sorted_keys = sorted(task_groups.keys(), key=lambda k: parse_time(k[1]))
-        sorted_groups = [task_groups[k] for k in sorted_keys]
-        
-        # For very large problems, limit the search space
-        MAX_COMBINATIONS = 1000  # Set a reasonable limit based on performance testing
-        total_combinations = 1
-        for group in sorted_groups:
-            total_combinations *= len(group)
-        
-        if total_combinations > MAX_COMBINATIONS:
-            # Apply heuristics for large problems
-            # For example, for each time slot, keep only the N closest buildings to previous location
-            # This is just a placeholder for the concept - implementation would depend on specific needs
-            print(f"Warning: Large search space ({total_combinations} combinations). Applying heuristics.")
-            return self.greedy_optimize_route()
-        
-        # For reasonable sized problems, use optimized branch and bound
-        return self.branch_and_bound_optimize(sorted_groups)
-
-    def branch_and_bound_optimize(self, sorted_groups):
-        """Optimized branch and bound approach for finding best schedule"""
-        min_distance = float('inf')
-        best_schedule = None
-        best_route = None
-        
-        # Helper function for recursive branching
-        def branch(current_index, current_schedule, current_location, accumulated_distance):
-            nonlocal min_distance, best_schedule, best_route
-            
-            # Base case: all groups processed
-            if current_index == len(sorted_groups):
-                # Calculate final route and distance
-                route, total_distance = find_optimal_route(self.G, current_schedule)
-                if total_distance < min_distance:
-                    min_distance = total_distance
-                    best_schedule = current_schedule.copy()
-                    best_route = route
-                return
-            
-            # Process current group
-            current_group = sorted_groups[current_index]
-            
-            # Sort tasks in this group by distance from current_location if available
-            if current_location and current_index > 0:
-                tasks_with_distance = []
-                for task in current_group:
-                    task_location = task['building_name']
-                    distance = calculate_travel_time(self.G, current_location, task_location)
-                    tasks_with_distance.append((task, distance))
-                
-                # Sort by distance (best candidates first for branch pruning)
-                sorted_tasks = [t[0] for t in sorted(tasks_with_distance, key=lambda x: x[1])]
-            else:
-                sorted_tasks = current_group
-            
-            # Try each task in the sorted group
-            for task in sorted_tasks:
-                # Calculate estimated distance increase
-                new_distance = accumulated_distance
-                if current_location:
-                    estimated_distance = calculate_travel_time(self.G, current_location, task['building_name'])
-                    new_distance += estimated_distance
-                    
-                    # Early pruning: skip this branch if already worse than best
-                    if new_distance >= min_distance:
-                        continue
-                
-                # Add task to current schedule
-                new_schedule = current_schedule + [task]
-                
-                # Recurse to next group
-                branch(current_index + 1, new_schedule, task['building_name'], new_distance)
-        
-        # Start branching from the first group with empty schedule
-        branch(0, [], None, 0)
-        
-        # Update UI with the best found solution
-        if best_schedule:
-            self.update_ui_with_solution(best_schedule, best_route, min_distance)
-            return best_schedule, best_route, min_distance
-        return [], [], 0
-
-    def greedy_optimize_route(self):
-        """Greedy approach for very large problems"""
-        # Sort all tasks by priority (high to low)
-        priority_values = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
-        sorted_tasks = sorted(self.selected_tasks, 
-                             key=lambda x: (-priority_values.get(x['priority'], 0), 
-                                           parse_time(x['time_start'])))
-        
-        schedule = []
-        current_location = None
-        
-        # Process tasks in time order
-        for time_slot in sorted(set([(t['time_start'], t['time_finish']) for t in sorted_tasks]), 
-                               key=lambda x: parse_time(x[0])):
-            
-            # Get all tasks in this time slot
-            slot_tasks = [t for t in sorted_tasks if (t['time_start'], t['time_finish']) == time_slot]
-            
-            # If no current location, pick highest priority task
-            if not current_location:
-                task = slot_tasks[0]  # Already sorted by priority
-            else:
-                # Find closest task from current location
-                min_distance = float('inf')
-                task = None
-                
-                # Group by priority
-                priority_groups = {}
-                for t in slot_tasks:
-                    p = t['priority']
-                    if p not in priority_groups:
-                        priority_groups[p] = []
-                    priority_groups[p].append(t)
-                
-                # Start with highest priority
-                for priority in sorted(priority_groups.keys(), 
-                                     key=lambda p: -priority_values.get(p, 0)):
-                    
-                    # Find closest task in this priority group
-                    for t in priority_groups[priority]:
-                        distance = calculate_travel_time(self.G, current_location, t['building_name'])
-                        if distance < min_distance:
-                            min_distance = distance
-                            task = t
-                    
-                    # If we found a task in this priority group, don't check lower priorities
-                    if task:
-                        break
-            
-            # Add selected task to schedule
-            if task:
-                schedule.append(task)
-                current_location = task['building_name']
-        
-        # Apply schedule optimization to handle any remaining time conflicts
-        optimized_schedule = optimize_schedule(schedule)
-        
-        # Calculate route and distance
-        route, total_distance = find_optimal_route(self.G, optimized_schedule)
-        
-        # Update UI
-        self.update_ui_with_solution(optimized_schedule, route, total_distance)
+        if self.solving():
+            return
         
-        return optimized_schedule, route, total_distance
+        self.solve_generation += 1
+        generation = self.solve_generation
+        G = self.G
+        tasks = list(self.selected_tasks)
+        cache = self.solution_cache
+        
+        # Solve and render the route figure off the Tk thread
+        def solve(worker):
+            schedule, route, total_distance = cached_optimize_route(cache, G, tasks,
+                                                                    worker.cancel_event, worker.report_progress)
+            fig = plot_route(G, route, csuf_locations)[0] if schedule else None
+            return schedule, route, total_distance, fig
+        
+        self.disable_task_controls()
+        self.day_combo.configure(state='disabled')
+        self.progress_bar['value'] = 0
+        self.cancel_button.configure(state='normal')
+        self.solve_worker = BackgroundWorker(self.root, solve,
+                                             on_done=lambda result: self.on_optimization_done(result, generation),
+                                             on_error=self.on_optimization_error,
+                                             on_cancel=self.on_optimization_finished,
+                                             on_progress=self.on_optimization_progress)
+    
+    def cancel_optimization(self):
+        if self.solving():
+            self.solve_worker.cancel()
+    
+    def on_optimization_progress(self, fraction):
+        self.progress_bar['value'] = fraction
+    
+    def on_optimization_finished(self):
+        self.progress_bar['value'] = 0
+        self.cancel_button.configure(state='disabled')
+        self.day_combo.configure(state='readonly')
+        self.enable_task_controls()
+    
+    def on_optimization_done(self, result, generation):
+        self.on_optimization_finished()
+        # The day was changed after this solve started; its route is no longer wanted
+        if generation != self.solve_generation:
+            return
+        schedule, route, total_distance, fig = result
+        if schedule:
+            self.update_ui_with_solution(schedule, route, total_distance, fig)
+        self.memory.record()
+    
+    def on_optimization_error(self, error):
+        self.on_optimization_finished()
+        messagebox.showerror("Error", f"Optimization failed: {error}")
 
-    def update_ui_with_solution(self, schedule, route, total_distance):
+    def update_ui_with_solution(self, schedule, route, total_distance, fig=None):
         """Update UI with the computed solution"""
         self.schedule = schedule
         
-        # Clear and update selected tasks listbox
-        self.selected_tasks_listbox.delete(0, tk.END)
-        self.selected_tasks = sorted(list({task['task_name']: task for task in schedule}.values()), 
-                                  key=lambda x: parse_time(x['time_start']))
-        
-        for task in self.selected_tasks:
-            task_str = f"{task['task_name']} ({task['building_name']}, {task['time_start']}-{task['time_finish']}, {task['priority']})"
-            self.selected_tasks_listbox.insert(tk.END, task_str)
+        # Update selected tasks; the list views redraw once when the models change
+        self.selected_tasks.set(sorted(list({task['task_name']: task for task in schedule}.values()), 
+                                       key=lambda x: parse_time(x['time_start'])))
         
         # Display optimized schedule
-        self.schedule_text.delete(1.0, tk.END)
-        self.schedule_text.insert(tk.END, "Optimized Schedule:\n\n")
+        self.schedule_rows.set(schedule)
         
-        for i, task in enumerate(schedule, 1):
-            self.schedule_text.insert(tk.END, f"{i}. {task['task_name']}\n")
-            self.schedule_text.insert(tk.END, f"   Location: {task['building_name']}\n")
-            self.schedule_text.insert(tk.END, f"   Time: {task['time_start']} - {task['time_finish']}\n")
-            self.schedule_text.insert(tk.END, f"   Priority: {task['priority']}\n\n")
-        
-        # Plot route
-        fig, ax = plot_route(self.G, route, csuf_locations)
+        # Plot route unless the figure was already rendered in the background
+        if fig is None:
+            fig, ax = plot_route(self.G, route, csuf_locations)
         
         # Update canvas
         if hasattr(self, 'canvas'):
             self.canvas_widget.destroy()
+        if self.map_hover:
+            self.map_hover.disconnect()
+            self.map_hover = None
+        self.map_points = None
+        self.close_map_figure()
         
         self.canvas = FigureCanvasTkAgg(fig, master=self.canvas_frame)
         self.canvas_widget = self.canvas.get_tk_widget()
@@ -872,11 +760,13 @@ class CSUFScheduleApp:
         self.enable_task_controls()
 
     def load_day_tasks(self, event=None):
+        # Any solve still in flight was for the previous day
+        self.solve_generation += 1
+        
         # Clear current tasks
-        self.selected_tasks = []
-        self.selected_tasks_listbox.delete(0, tk.END)
+        self.selected_tasks.clear()
         self.schedule = []
-        self.schedule_text.delete(1.0, tk.END)
+        self.schedule_rows.clear()
         self.route_info_text.delete(1.0, tk.END)
         
         # Get tasks for selected day
@@ -884,14 +774,10 @@ class CSUFScheduleApp:
         if selected_day in weekly_schedule:
             day_tasks = weekly_schedule[selected_day]
             
-            # Add each task to the selected tasks list
+            # Add the tasks whose building exists in csuf_locations in one batch
+            self.selected_tasks.extend(task for task in day_tasks if task['building_name'] in csuf_locations)
             for task in day_tasks:
-                # Verify the building exists in csuf_locations
-                if task['building_name'] in csuf_locations:
-                    self.selected_tasks.append(task)
-                    task_str = f"{task['task_name']} ({task['building_name']}, {task['time_start']}-{task['time_finish']}, {task['priority']})"
-                    self.selected_tasks_listbox.insert(tk.END, task_str)
-                else:
+                if task['building_name'] not in csuf_locations:
                     messagebox.showwarning("Warning", f"Building '{task['building_name']}' not found in campus locations. Task '{task['task_name']}' will be skipped.")
             
             # Enable task controls after loading tasks
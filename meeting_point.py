@@ -0,0 +1,73 @@
+import numpy as np
+from routing import travel_matrix
+
+# How the walking times of a group's members are combined into one cost
+OBJECTIVES = ("sum", "max")
+
+def _top_k(costs, candidates, k):
+    # The k cheapest candidates as [(building, minutes)], cheapest first, unreachable ones left out
+    k = min(k, len(candidates))
+    best = np.argpartition(costs, k - 1)[:k] if k < len(candidates) else np.arange(len(candidates))
+    best = best[np.argsort(costs[best], kind='stable')]
+    return [(candidates[i], float(costs[i])) for i in best if np.isfinite(costs[i])]
+
+def meeting_points_batch(G, groups, k=3, objective="sum", candidates=None):
+    """
+    Best meeting buildings for many groups at once. groups is a list of lists
+    of origin buildings. One travel matrix covers every distinct origin, and
+    each group's costs are a masked sum or max over its rows, computed for
+    all groups in a single array reduction. Returns one top-k list of
+    (building, minutes) per group, where minutes is the total or the longest
+    walk in the group.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective '{objective}', expected one of {OBJECTIVES}")
+    candidates = list(G.nodes()) if candidates is None else list(candidates)
+    if not groups or not candidates:
+        return [[] for _ in groups]
+
+    origins = list(dict.fromkeys(origin for group in groups for origin in group))
+    row = {origin: i for i, origin in enumerate(origins)}
+    times, _ = travel_matrix(G, origins, candidates)
+
+    # Pad groups to the same size; padded slots point at row 0 and are masked out
+    width = max(len(group) for group in groups)
+    index = np.zeros((len(groups), width), dtype=np.int64)
+    mask = np.zeros((len(groups), width), dtype=bool)
+    for g, group in enumerate(groups):
+        index[g, :len(group)] = [row[origin] for origin in group]
+        mask[g, :len(group)] = True
+
+    member_times = times[index]  # groups x width x candidates
+    if objective == "sum":
+        costs = np.where(mask[:, :, None], member_times, 0.0).sum(axis=1)
+    else:
+        costs = np.where(mask[:, :, None], member_times, -np.inf).max(axis=1)
+
+    return [_top_k(group_costs, candidates, k) if len(group) else []
+            for group, group_costs in zip(groups, costs)]
+
+def meeting_points(G, origins, k=3, objective="sum", candidates=None):
+    """
+    Top-k buildings for people at the given origin buildings to meet,
+    minimizing the total ("sum") or the longest ("max") walking time.
+    """
+    return meeting_points_batch(G, [list(origins)], k, objective, candidates)[0]
+
+if __name__ == "__main__":
+    from graph_builder import build_csuf_graph
+
+    G, _ = build_csuf_graph()
+    group = ["McCarthy Hall", "Mihaylo Hall", "Computer Science", "Titan Student Union"]
+
+    for objective in OBJECTIVES:
+        print(f"Best meeting points for {', '.join(group)} ({objective}):")
+        for building, minutes in meeting_points(G, group, k=3, objective=objective):
+            print(f"  {building}: {minutes:.1f} min")
+
+    # Batch mode: random study groups of three
+    rng = np.random.default_rng(0)
+    buildings = list(G.nodes())
+    groups = [rng.choice(buildings, size=3, replace=False).tolist() for _ in range(1000)]
+    results = meeting_points_batch(G, groups, k=1, objective="max")
+    print(f"{len(results)} groups placed, e.g. {groups[0]} -> {results[0][0][0]}")
@@ -0,0 +1,253 @@
+import atexit
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import types
+import numpy as np
+
+# Objects shared by the whole process; sizing them would count the interpreter, not the app
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+                 types.MethodType, types.CodeType, types.FrameType)
+
+def deep_sizeof(obj, seen=None):
+    """
+    Estimate the bytes held by obj and everything it references: containers,
+    instance __dict__/__slots__ and NumPy buffers. Objects already in seen
+    (a set of ids) are skipped, so one seen set can be shared across calls to
+    avoid counting shared data twice. Modules, classes and functions are not followed.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+
+        if isinstance(obj, np.ndarray):
+            # Views report only their header; count the buffer once via the base
+            total += sys.getsizeof(obj)
+            if obj.base is not None:
+                stack.append(obj.base)
+            continue
+
+        try:
+            total += sys.getsizeof(obj)
+        except TypeError:
+            continue
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, (str, bytes, bytearray, int, float, complex, bool)):
+            continue
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, '__slots__', ()):
+                    if isinstance(slot, str) and hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+    return total
+
+def figure_sizeof(fig, seen=None):
+    """
+    Estimate the bytes held by a matplotlib figure: basemap images, line and
+    marker data, and the Agg pixel buffer once it has been drawn. The artist
+    tree itself is not walked, since it links back into Tk and the whole app.
+    """
+    if seen is None:
+        seen = set()
+    if id(fig) in seen:
+        return 0
+    seen.add(id(fig))
+
+    total = 0
+    for ax in fig.axes:
+        for image in ax.get_images():
+            array = image.get_array()
+            if array is not None:
+                total += np.asarray(array).nbytes
+        for line in ax.get_lines():
+            total += line.get_xydata().nbytes
+        for collection in ax.collections:
+            total += np.asarray(collection.get_offsets()).nbytes
+        total += 200 * len(ax.texts)
+
+    renderer = getattr(fig.canvas, 'renderer', None)
+    if renderer is not None:
+        total += int(renderer.width) * int(renderer.height) * 4
+    return total
+
+# Group a tracemalloc frame by the package or module that allocated it
+def _source_group(filename):
+    parts = filename.replace('\\', '/').split('/')
+    if 'site-packages' in parts:
+        return parts[parts.index('site-packages') + 1].split('.')[0]
+    if os.path.dirname(os.path.abspath(filename)) == os.path.dirname(os.path.abspath(__file__)):
+        return os.path.splitext(parts[-1])[0]
+    if filename.startswith('<'):
+        return filename
+    return 'python'
+
+def _format_bytes(n):
+    for unit in ('B', 'KB', 'MB'):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+class MemoryTracker:
+    """
+    Memory accounting broken down by subsystem. Each subsystem is a function
+    returning the objects it owns, sized with deep_sizeof (or a custom sizer)
+    at report time. Subsystems share one seen set in registration order, so
+    data reachable from an earlier one is not counted again. With tracing on,
+    tracemalloc totals are added and grouped by allocating package.
+    record() takes a sample after each solve so growth can be tracked.
+    """
+
+    def __init__(self, trace=False, frames=1):
+        self.subsystems = {}
+        self.samples = []
+        self._baseline = None
+        self._last = None
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def register(self, name, objects, sizer=deep_sizeof):
+        """objects() returns an iterable of the objects owned by the subsystem."""
+        self.subsystems[name] = (objects, sizer)
+
+    def estimate(self):
+        """{subsystem: estimated bytes} for every registered subsystem."""
+        seen = set()
+        sizes = {}
+        for name, (objects, sizer) in self.subsystems.items():
+            sizes[name] = sum(sizer(obj, seen) for obj in objects() if obj is not None)
+        return sizes
+
+    def record(self, label="solve"):
+        """Take a sample now; comparing samples shows growth across repeated solves."""
+        sample = {
+            "label": label,
+            "time": time.time(),
+            "subsystems": self.estimate(),
+            "gc_objects": len(gc.get_objects()),
+            "traced": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None,
+        }
+        self.samples.append(sample)
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            if self._baseline is None:
+                self._baseline = snapshot
+            self._last = snapshot
+        return sample
+
+    def traced_by_source(self, snapshot=None, top=10):
+        """[(package or module, bytes)] of live traced allocations, largest first."""
+        if snapshot is None:
+            if not tracemalloc.is_tracing():
+                return []
+            snapshot = tracemalloc.take_snapshot()
+        groups = {}
+        for stat in snapshot.statistics('filename'):
+            group = _source_group(stat.traceback[0].filename)
+            groups[group] = groups.get(group, 0) + stat.size
+        return sorted(groups.items(), key=lambda item: -item[1])[:top]
+
+    def growth(self, top=10):
+        """
+        Change between the first and latest samples: per subsystem, in gc
+        objects, in traced bytes, and the source lines that grew the most.
+        """
+        if len(self.samples) < 2:
+            return None
+        first, last = self.samples[0], self.samples[-1]
+        solves = len(self.samples) - 1
+        result = {
+            "samples": len(self.samples),
+            "subsystems": {name: size - first["subsystems"].get(name, 0)
+                           for name, size in last["subsystems"].items()},
+            "gc_objects": last["gc_objects"] - first["gc_objects"],
+            "traced": None,
+            "per_solve": None,
+            "top_lines": [],
+        }
+        if first["traced"] is not None and last["traced"] is not None:
+            result["traced"] = last["traced"] - first["traced"]
+            result["per_solve"] = result["traced"] / solves
+        if self._baseline is not None and self._last is not self._baseline:
+            stats = self._last.compare_to(self._baseline, 'lineno')
+            result["top_lines"] = [(str(stat.traceback[0]), stat.size_diff)
+                                   for stat in stats[:top] if stat.size_diff > 0]
+        return result
+
+    def report(self, top=10):
+        """The full report as a dict: estimates, tracemalloc totals and growth."""
+        report = {"subsystems": self.estimate(), "traced": None, "peak": None,
+                  "by_source": [], "growth": self.growth(top)}
+        if tracemalloc.is_tracing():
+            report["traced"], report["peak"] = tracemalloc.get_traced_memory()
+            report["by_source"] = self.traced_by_source(top=top)
+        return report
+
+    def format_report(self, top=10):
+        report = self.report(top)
+        lines = ["Memory report", "", "Estimated size by subsystem:"]
+        for name, size in report["subsystems"].items():
+            lines.append(f"  {name:<20} {_format_bytes(size):>10}")
+        lines.append(f"  {'total':<20} {_format_bytes(sum(report['subsystems'].values())):>10}")
+
+        if report["traced"] is None:
+            lines += ["", "tracemalloc is off (set GEOPATH_MEMORY_REPORT=1 to trace allocations)"]
+        else:
+            lines += ["", f"Traced: {_format_bytes(report['traced'])} (peak {_format_bytes(report['peak'])})"]
+            for source, size in report["by_source"]:
+                lines.append(f"  {source:<20} {_format_bytes(size):>10}")
+
+        growth = report["growth"]
+        if growth:
+            lines += ["", f"Growth over {growth['samples'] - 1} solves:"]
+            for name, delta in growth["subsystems"].items():
+                lines.append(f"  {name:<20} {_format_bytes(delta):>10}")
+            lines.append(f"  {'gc objects':<20} {growth['gc_objects']:>+10}")
+            if growth["traced"] is not None:
+                lines.append(f"  {'traced':<20} {_format_bytes(growth['traced']):>10} "
+                             f"({_format_bytes(growth['per_solve'])} per solve)")
+            for where, delta in growth["top_lines"]:
+                lines.append(f"  +{_format_bytes(delta)}  {where}")
+        return "\n".join(lines)
+
+    def install_atexit(self, stream=None):
+        """Print the report when the process exits."""
+        atexit.register(lambda: print(self.format_report(), file=stream or sys.stderr))
+
+if __name__ == "__main__":
+    from data_loader import get_data
+    from graph_builder import build_csuf_graph
+    from routing import cached_structures, get_leg_cache
+    from solution_cache import SolutionCache, cached_optimize_route
+
+    tracker = MemoryTracker(trace=True)
+    data = get_data()
+    G, _ = build_csuf_graph()
+    cache = SolutionCache()
+
+    tracker.register("graph", lambda: [G])
+    tracker.register("task catalog", lambda: [data])
+    tracker.register("search indexes", lambda: [cached_structures(G)[0]])
+    tracker.register("caches", lambda: [cache, get_leg_cache(G)])
+
+    tracker.record("start")
+    for day, day_tasks in data.weekly_schedule.items():
+        tasks = [t for t in day_tasks if t['building_name'] in G]
+        cached_optimize_route(cache, G, tasks)
+        tracker.record(day)
+    print(tracker.format_report())
@@ -0,0 +1,184 @@
+import argparse
+import glob
+import json
+import os
+from array import array
+import numpy as np
+from graph_utils import haversine_np
+from json_stream import iter_json_array
+
+# Coordinates are stored as fixed-point integers, like OSM itself (1e-7 degrees)
+COORD_SCALE = 10_000_000
+
+# Arrays making up a converted graph, each stored as <name>.npy
+GRAPH_ARRAYS = (
+    "node_ids",      # int64 [n]    OSM node ids, sorted
+    "node_coords",   # int32 [n, 2] lat, lon * COORD_SCALE
+    "way_ids",       # int64 [w]    OSM way ids
+    "way_offsets",   # int64 [w+1]  CSR offsets into way_nodes
+    "way_nodes",     # int32 [k]    node indices, -1 for nodes missing from the extract
+    "edge_offsets",  # int64 [n+1]  CSR offsets into edge_targets per node
+    "edge_targets",  # int32 [m]    neighbour node indices
+    "edge_lengths",  # float32 [m]  edge length in meters
+)
+
+class OSMGraph:
+    """Array-backed OSM extract. Arrays are read-only memory maps when loaded from disk."""
+
+    def __init__(self, **arrays):
+        for name in GRAPH_ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @property
+    def num_nodes(self):
+        return len(self.node_ids)
+
+    @property
+    def num_ways(self):
+        return len(self.way_ids)
+
+    def node_index(self, node_id):
+        i = int(np.searchsorted(self.node_ids, node_id))
+        if i == len(self.node_ids) or self.node_ids[i] != node_id:
+            raise KeyError(node_id)
+        return i
+
+    def node_latlon(self, index):
+        lat, lon = self.node_coords[index]
+        return lat / COORD_SCALE, lon / COORD_SCALE
+
+    def way_node_indices(self, way_index):
+        return self.way_nodes[self.way_offsets[way_index]:self.way_offsets[way_index + 1]]
+
+    def neighbors(self, index):
+        start, end = self.edge_offsets[index], self.edge_offsets[index + 1]
+        return self.edge_targets[start:end], self.edge_lengths[start:end]
+
+def parse_overpass(f):
+    """
+    Stream an Overpass JSON response into an OSMGraph. Elements are read one at
+    a time and packed into typed buffers, so no per-element dicts are retained.
+    """
+    node_ids = array('q')
+    lats = array('i')
+    lons = array('i')
+    way_ids = array('q')
+    way_lengths = array('q')
+    way_refs = array('q')
+
+    for element in iter_json_array(f, ('elements',)):
+        kind = element.get('type')
+        if kind == 'node':
+            node_ids.append(element['id'])
+            lats.append(round(element['lat'] * COORD_SCALE))
+            lons.append(round(element['lon'] * COORD_SCALE))
+        elif kind == 'way':
+            refs = element.get('nodes', [])
+            way_ids.append(element['id'])
+            way_lengths.append(len(refs))
+            way_refs.extend(refs)
+
+    return build_osm_graph(
+        np.frombuffer(node_ids, dtype=np.int64),
+        np.stack([np.frombuffer(lats, dtype=np.int32), np.frombuffer(lons, dtype=np.int32)], axis=1),
+        np.frombuffer(way_ids, dtype=np.int64),
+        np.frombuffer(way_lengths, dtype=np.int64),
+        np.frombuffer(way_refs, dtype=np.int64),
+    )
+
+def build_osm_graph(node_ids, node_coords, way_ids, way_lengths, way_refs):
+    # Sort nodes by id so lookups are a binary search
+    order = np.argsort(node_ids, kind='stable')
+    node_ids = node_ids[order]
+    node_coords = node_coords[order]
+    n = len(node_ids)
+
+    way_offsets = np.zeros(len(way_ids) + 1, dtype=np.int64)
+    np.cumsum(way_lengths, out=way_offsets[1:])
+
+    # Translate OSM node ids to node indices
+    positions = np.searchsorted(node_ids, way_refs)
+    clipped = np.minimum(positions, max(n - 1, 0))
+    found = (positions < n) & (node_ids[clipped] == way_refs) if n else np.zeros(len(way_refs), dtype=bool)
+    way_nodes = np.where(found, clipped, -1).astype(np.int32)
+
+    # Consecutive nodes within the same way become edges
+    if len(way_nodes) > 1:
+        # Do not link the last node of one way to the first node of the next
+        boundaries = way_offsets[1:-1]
+        boundaries = boundaries[(boundaries > 0) & (boundaries < len(way_nodes))]
+        same_way = np.ones(len(way_nodes) - 1, dtype=bool)
+        same_way[boundaries - 1] = False
+        src = way_nodes[:-1]
+        dst = way_nodes[1:]
+        valid = same_way & (src >= 0) & (dst >= 0) & (src != dst)
+        src, dst = src[valid], dst[valid]
+    else:
+        src = dst = np.empty(0, dtype=np.int32)
+
+    # Walkways are undirected: store both directions and drop duplicates
+    pairs = np.unique(np.stack([np.concatenate([src, dst]), np.concatenate([dst, src])], axis=1), axis=0) \
+        if len(src) else np.empty((0, 2), dtype=np.int32)
+    edge_sources = pairs[:, 0]
+    edge_targets = pairs[:, 1].astype(np.int32)
+
+    lat = node_coords[:, 0] / COORD_SCALE
+    lon = node_coords[:, 1] / COORD_SCALE
+    edge_lengths = haversine_np(lat[edge_sources], lon[edge_sources],
+                                lat[edge_targets], lon[edge_targets]).astype(np.float32)
+
+    edge_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edge_sources, minlength=n), out=edge_offsets[1:])
+
+    return OSMGraph(
+        node_ids=node_ids,
+        node_coords=node_coords,
+        way_ids=way_ids.copy(),
+        way_offsets=way_offsets,
+        way_nodes=way_nodes,
+        edge_offsets=edge_offsets,
+        edge_targets=edge_targets,
+        edge_lengths=edge_lengths,
+    )
+
+def save_osm_graph(graph, path):
+    os.makedirs(path, exist_ok=True)
+    for name in GRAPH_ARRAYS:
+        np.save(os.path.join(path, f"{name}.npy"), getattr(graph, name))
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"num_nodes": graph.num_nodes, "num_ways": graph.num_ways,
+                   "num_edges": int(len(graph.edge_targets)), "coord_scale": COORD_SCALE}, f)
+
+def load_osm_graph(path, mmap=True):
+    """Load a converted graph. With mmap=True arrays are paged in lazily from disk."""
+    mode = 'r' if mmap else None
+    return OSMGraph(**{name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode)
+                       for name in GRAPH_ARRAYS})
+
+def convert_overpass_file(json_path, out_path=None):
+    """
+    One-time conversion of a cached Overpass response to the array format.
+    Files without Overpass nodes (e.g. Nominatim results) are not written.
+    """
+    if out_path is None:
+        out_path = os.path.splitext(json_path)[0] + ".npgraph"
+    with open(json_path, "r") as f:
+        graph = parse_overpass(f)
+    if graph.num_nodes:
+        save_osm_graph(graph, out_path)
+    return out_path, graph
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert cached Overpass JSON to a compact array graph")
+    parser.add_argument("inputs", nargs="*", help="Overpass JSON files (default: cache/*.json)")
+    parser.add_argument("-o", "--output", help="output directory (single input only)")
+    args = parser.parse_args()
+
+    inputs = args.inputs or sorted(glob.glob(os.path.join("cache", "*.json")))
+    for json_path in inputs:
+        out_path, graph = convert_overpass_file(json_path, args.output if len(inputs) == 1 else None)
+        if graph.num_nodes == 0:
+            print(f"{json_path}: no Overpass nodes, skipped")
+            continue
+        print(f"{json_path} -> {out_path}: {graph.num_nodes} nodes, {graph.num_ways} ways, "
+              f"{len(graph.edge_targets)} directed edges")
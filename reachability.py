@@ -0,0 +1,74 @@
+import numpy as np
+from conflicts import time_to_minutes
+from data_loader import get_data
+from routing import WALKING_SPEED, distances_from, travel_matrix
+
+def minutes_to_meters(minutes):
+    return minutes * 60 * WALKING_SPEED
+
+def reachable_buildings(G, origins, minutes):
+    """
+    Buildings reachable within a walking time budget from one or many origins
+    (a building name or a list). One bounded multi-source search, so each
+    building is reported with the time from its nearest origin.
+    Returns {building: minutes}, closest first.
+    """
+    if isinstance(origins, str):
+        origins = [origins]
+    distances = distances_from(G, origins, cutoff=minutes_to_meters(minutes))
+    times = {building: (meters / WALKING_SPEED) / 60 for building, meters in distances.items()}
+    return dict(sorted(times.items(), key=lambda item: item[1]))
+
+def schedule_gaps(weekly_schedule):
+    """
+    Yield (day, task, next_task, gap_minutes) for every pair of consecutive
+    tasks in each day of the weekly schedule.
+    """
+    for day, day_tasks in weekly_schedule.items():
+        ordered = sorted(day_tasks, key=lambda t: time_to_minutes(t['time_start']))
+        for task, next_task in zip(ordered, ordered[1:]):
+            gap = time_to_minutes(next_task['time_start']) - time_to_minutes(task['time_finish'])
+            yield day, task, next_task, gap
+
+def reachability_between_classes(G, weekly_schedule):
+    """
+    For every gap between consecutive classes, list the buildings reachable from
+    the earlier class's building before the next class starts. All gaps share a
+    single origins x buildings travel-time matrix, filtered per gap.
+    """
+    gaps = [g for g in schedule_gaps(weekly_schedule) if g[1]['building_name'] in G]
+    if not gaps:
+        return []
+
+    origins = list(dict.fromkeys(task['building_name'] for _, task, _, _ in gaps))
+    origin_row = {origin: i for i, origin in enumerate(origins)}
+    buildings = np.array(list(G.nodes()), dtype=object)
+    times, _ = travel_matrix(G, origins, buildings)
+
+    results = []
+    for day, task, next_task, gap in gaps:
+        row = times[origin_row[task['building_name']]]
+        within = np.flatnonzero(row <= gap)
+        within = within[np.argsort(row[within], kind='stable')]
+        results.append({
+            "day": day,
+            "from_task": task['task_name'],
+            "to_task": next_task['task_name'],
+            "origin": task['building_name'],
+            "gap_minutes": gap,
+            "reachable": dict(zip(buildings[within].tolist(), row[within].tolist())),
+        })
+    return results
+
+if __name__ == "__main__":
+    from graph_builder import build_csuf_graph
+
+    G, _ = build_csuf_graph()
+
+    print("Reachable from McCarthy Hall in 15 minutes:")
+    for building, minutes in reachable_buildings(G, "McCarthy Hall", 15).items():
+        print(f"  {building}: {minutes:.1f} min")
+
+    for gap in reachability_between_classes(G, get_data().weekly_schedule):
+        print(f"{gap['day']} {gap['from_task']} -> {gap['to_task']} "
+              f"({gap['gap_minutes']} min): {len(gap['reachable'])} buildings reachable")
@@ -0,0 +1,209 @@
+import os
+import weakref
+from collections import namedtuple
+import numpy as np
+import networkx as nx
+from csr_graph import CSRGraph
+from graph_utils import graph_signature, update_fingerprint
+import leg_cache
+import contraction
+
+# Assuming average walking speed of 1.4 m/s (5 km/h)
+WALKING_SPEED = 1.4
+
+# "networkx" runs nx.shortest_path on the graph itself; "csr" runs Dijkstra/A*
+# on a CSRGraph built once per graph; "ch" answers point-to-point queries from a
+# contraction hierarchy (saved under GEOPATH_CH_PATH if set) and uses the CSR
+# graph for one-to-many searches; after an in-place location change it falls
+# back to the CSR graph until rebuild_contraction_hierarchy() is called
+ROUTING_BACKENDS = ("networkx", "csr", "ch")
+_routing_backend = os.environ.get("GEOPATH_ROUTING_BACKEND", "networkx")
+
+# CSR copies of nx graphs and their route leg caches, keyed by the graph object
+_csr_graphs = weakref.WeakKeyDictionary()
+_leg_caches = weakref.WeakKeyDictionary()
+_hierarchies = weakref.WeakKeyDictionary()  # graph -> (signature, hierarchy), or None while stale
+
+# A location added, moved or removed in place (see graph_builder.add_location and friends).
+# kind is "add", "move" or "remove"; positions are (lon, lat) like the 'pos' node attribute;
+# edges are (u, v, weight) triples; old_signature is graph_signature(G) before the change.
+GraphChange = namedtuple('GraphChange', ['kind', 'node', 'old_pos', 'new_pos',
+                                         'removed_edges', 'added_edges', 'old_signature'])
+
+def set_routing_backend(name):
+    global _routing_backend
+    if name not in ROUTING_BACKENDS:
+        raise ValueError(f"Unknown routing backend '{name}', expected one of {ROUTING_BACKENDS}")
+    _routing_backend = name
+
+def get_routing_backend():
+    return _routing_backend
+
+def get_csr_graph(G):
+    """Return a CSRGraph for G, building it on first use and after G changes."""
+    if isinstance(G, CSRGraph):
+        return G
+    signature = graph_signature(G)
+    cached = _csr_graphs.get(G)
+    if cached is None or cached[0] != signature:
+        cached = (signature, CSRGraph.from_networkx(G))
+        _csr_graphs[G] = cached
+    return cached[1]
+
+def get_contraction_hierarchy(G):
+    """
+    Return the ContractionHierarchy for G, building (or loading) it on first
+    use and after G is rebuilt. Returns None while it is stale after an
+    in-place location change, rather than re-contracting the whole graph.
+    """
+    if G in _hierarchies and _hierarchies[G] is None:
+        return None
+    signature = graph_signature(G)
+    cached = _hierarchies.get(G)
+    if cached is None or cached[0] != signature:
+        cached = (signature, contraction.hierarchy_for_graph(G, os.environ.get("GEOPATH_CH_PATH")))
+        _hierarchies[G] = cached
+    return cached[1]
+
+def rebuild_contraction_hierarchy(G):
+    """Contract G again (or load a matching saved hierarchy) after in-place location changes."""
+    _hierarchies.pop(G, None)
+    return get_contraction_hierarchy(G)
+
+def get_leg_cache(G):
+    """Return the LegCache holding per-building-pair route legs for G."""
+    cache = _leg_caches.get(G)
+    if cache is None:
+        cache = leg_cache.LegCache(G)
+        _leg_caches[G] = cache
+    return cache
+
+def cached_structures(G):
+    """The CSRGraph and LegCache currently held for G (None if not built), for memory accounting."""
+    cached = _csr_graphs.get(G)
+    return (cached[1] if cached else None), _leg_caches.get(G)
+
+def apply_graph_change(G, change):
+    """
+    Update the structures derived from G after an in-place location change.
+    The graph fingerprint is adjusted for the touched elements and the leg
+    cache drops only legs the change can affect. The CSR copy is patched
+    with vectorized array edits (see CSRGraph.apply_change), which still
+    copies its O(n + m) arrays but skips the per-edge rebuild. The
+    contraction hierarchy is marked stale and the "ch" backend routes on the
+    CSR graph until rebuild_contraction_hierarchy(G).
+    """
+    update_fingerprint(G, change)
+    cached = _csr_graphs.get(G)
+    if cached is not None:
+        if cached[0] == change.old_signature:
+            cached[1].apply_change(change)
+            _csr_graphs[G] = (graph_signature(G), cached[1])
+        else:
+            del _csr_graphs[G]
+    if G in _hierarchies:
+        _hierarchies[G] = None
+    cache = _leg_caches.get(G)
+    if cache is not None:
+        cache.apply_change(change)
+
+def _use_csr(G):
+    return isinstance(G, CSRGraph) or _routing_backend in ("csr", "ch")
+
+# Shortest path and its length in meters, or (None, inf) if there is no path
+def shortest_path_with_distance(G, start_building, end_building):
+    if _routing_backend == "ch" and not isinstance(G, CSRGraph):
+        ch = get_contraction_hierarchy(G)
+        if ch is not None:
+            return ch.shortest_path_with_distance(start_building, end_building)
+    if _use_csr(G):
+        return get_csr_graph(G).shortest_path_with_distance(start_building, end_building)
+    try:
+        path = nx.shortest_path(G, source=start_building, target=end_building, weight='weight')
+    except nx.NetworkXNoPath:
+        return None, float('inf')
+    distance = sum(G[path[i]][path[i+1]]['weight'] for i in range(len(path)-1))
+    return path, distance
+
+# Find shortest path between buildings using Dijkstra's algorithm
+def find_shortest_path(G, start_building, end_building):
+    return shortest_path_with_distance(G, start_building, end_building)[0]
+
+# Calculate travel time between buildings (in minutes)
+def calculate_travel_time(G, building1, building2):
+    path, distance = shortest_path_with_distance(G, building1, building2)
+    if path is None:
+        return float('inf')
+    travel_time_minutes = (distance / WALKING_SPEED) / 60
+    return travel_time_minutes
+
+# Find the optimal route between buildings for a given schedule
+def find_optimal_route(G, schedule):
+    if not schedule:
+        return [], 0
+
+    route = []
+    total_distance = 0
+    buildings = [task['building_name'] for task in schedule]
+    legs = get_leg_cache(G)
+
+    # Start from the first building
+    current_building = buildings[0]
+    route.append(current_building)
+
+    # Concatenate the cached shortest path to each subsequent building
+    for next_building in buildings[1:]:
+        if current_building != next_building:
+            leg = legs.leg(current_building, next_building)
+            if leg.path:
+                # Calculate distance for this segment
+                total_distance += leg.distance
+                # Add intermediate buildings to route (excluding the starting point which is already in the route)
+                route.extend(leg.path[1:])
+            else:
+                # If no path found, just add the destination
+                route.append(next_building)
+
+        current_building = next_building
+
+    return route, total_distance
+
+def travel_matrix(G, sources, targets):
+    """
+    Many-to-many walking times and distances. Runs one single-source search per
+    distinct source building and returns two len(sources) x len(targets)
+    arrays: travel time in minutes and distance in meters (inf if unreachable).
+    """
+    sources = list(sources)
+    targets = list(targets)
+    distances = np.full((len(sources), len(targets)), np.inf)
+
+    rows = {}
+    for i, source in enumerate(sources):
+        rows.setdefault(source, []).append(i)
+
+    if _use_csr(G):
+        csr = get_csr_graph(G)
+        target_index = np.array([csr.index[t] for t in targets], dtype=np.int64)
+        for source, row_ids in rows.items():
+            distances[row_ids] = csr.dijkstra(source)[target_index]
+    else:
+        for source, row_ids in rows.items():
+            lengths = nx.single_source_dijkstra_path_length(G, source, weight='weight')
+            distances[row_ids] = [lengths.get(t, np.inf) for t in targets]
+
+    times = (distances / WALKING_SPEED) / 60
+    return times, distances
+
+def distances_from(G, sources, cutoff=None):
+    """
+    Walking distance in meters from the nearest of the given source buildings
+    to every building reachable within cutoff meters, as a dict.
+    """
+    sources = list(sources)
+    if _use_csr(G):
+        csr = get_csr_graph(G)
+        dist = csr.multi_source_dijkstra(sources, cutoff=cutoff)
+        reached = np.flatnonzero(np.isfinite(dist))
+        return {csr.nodes[i]: float(dist[i]) for i in reached}
+    return nx.multi_source_dijkstra_path_length(G, sources, cutoff=cutoff, weight='weight')
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from graph_utils import graph_fingerprint
+from solver import optimize_route
+
+TASK_FIELDS = ('task_name', 'building_name', 'time_start', 'time_finish', 'priority')
+
+def canonical_tasks(tasks):
+    # Order-independent form of a task set: sorted, with only the fields the solver reads
+    return sorted(tasks, key=lambda t: tuple(t[field] for field in TASK_FIELDS))
+
+def task_set_key(tasks, graph_version):
+    """sha1 of the canonical task set and graph version, named like the files in cache/."""
+    payload = json.dumps([[t[field] for field in TASK_FIELDS] for t in canonical_tasks(tasks)])
+    return hashlib.sha1(f"{graph_version}\n{payload}".encode()).hexdigest()
+
+class SolutionCache:
+    """
+    Two-tier cache of solved schedules: an in-memory LRU of up to max_entries
+    results and, if disk_dir is given, one <key>.json file per result on disk.
+    """
+
+    def __init__(self, max_entries=256, disk_dir=None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()  # key -> (value, size in bytes)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _remember(self, key, value, size):
+        if key in self._entries:
+            self.bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+            if self.disk_dir and os.path.exists(self._disk_path(key)):
+                try:
+                    with open(self._disk_path(key), 'r') as f:
+                        data = f.read()
+                    value = json.loads(data)
+                except (OSError, json.JSONDecodeError):
+                    # Unreadable or damaged entry: solve again and let put() replace it
+                    value = None
+                if value is not None:
+                    self._remember(key, value, len(data))
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        data = json.dumps(value)
+        with self._lock:
+            self._remember(key, value, len(data))
+            if self.disk_dir:
+                # Write a private temp file then rename, so readers never see a partial
+                # file and processes sharing disk_dir never write the same temp file
+                tmp_path = None
+                try:
+                    with tempfile.NamedTemporaryFile('w', dir=self.disk_dir, suffix='.tmp', delete=False) as f:
+                        tmp_path = f.name
+                        f.write(data)
+                    os.replace(tmp_path, self._disk_path(key))
+                except OSError:
+                    # The result is still cached in memory; the disk copy is best effort
+                    if tmp_path:
+                        try:
+                            os.remove(tmp_path)
+                        except OSError:
+                            pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": self.bytes,
+        }
+
+def cached_optimize_route(cache, G, tasks, cancel_event=None, progress=None):
+    """
+    optimize_route() through a SolutionCache. Tasks are solved in canonical
+    order so the same set always yields the same cached answer. Results of
+    a solve whose cancel_event was set are returned but not cached.
+    """
+    key = task_set_key(tasks, graph_fingerprint(G))
+    cached = cache.get(key)
+    if cached is not None:
+        if progress:
+            progress(1.0)
+        return cached["schedule"], cached["route"], cached["total_distance"]
+
+    schedule, route, total_distance = optimize_route(G, canonical_tasks(tasks), cancel_event, progress)
+    # A cancelled solve can return early with a worse schedule; don't keep it
+    if cancel_event is None or not cancel_event.is_set():
+        cache.put(key, {"schedule": schedule, "route": route, "total_distance": total_distance})
+    return schedule, route, total_distance
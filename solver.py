@@ -0,0 +1,344 @@
+import math
+import random
+import time
+import warnings
+from datetime import datetime as dt
+import numpy as np
+from routing import find_optimal_route, travel_matrix
+
+# Define priority values
+PRIORITY_VALUES = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+
+# Above this many task combinations the greedy solver is used instead of branch and bound
+MAX_COMBINATIONS = 1000  # Set a reasonable limit based on performance testing
+
+# Seconds of local search after the greedy solver (0 disables it)
+LOCAL_SEARCH_TIME = 0.2
+
+class SolveCancelled(Exception):
+    """Raised inside a solver when its cancel event is set."""
+
+# Parse time string to datetime object
+def parse_time(time_str):
+    return dt.strptime(time_str, "%H:%M").time()
+
+# Check if two tasks overlap
+def tasks_overlap(task1, task2):
+    task1_start = parse_time(task1['time_start'])
+    task1_end = parse_time(task1['time_finish'])
+    task2_start = parse_time(task2['time_start'])
+    task2_end = parse_time(task2['time_finish'])
+
+    # Check if task2 starts before task1 ends and task2 ends after task1 starts
+    return (task2_start < task1_end) and (task2_end > task1_start)
+
+# Sort tasks by priority and resolve time conflicts
+def optimize_schedule(tasks):
+    # Sort tasks by priority (higher priority first) and then by start time
+    sorted_tasks = sorted(
+        tasks,
+        key=lambda x: (
+            -PRIORITY_VALUES.get(x['priority'], 0),  # Negative to sort in descending order
+            parse_time(x['time_start'])
+        )
+    )
+
+    optimized_schedule = []
+
+    for task in sorted_tasks:
+        # Check if current task overlaps with any task in the optimized schedule
+        overlaps = False
+        for scheduled_task in optimized_schedule:
+            if tasks_overlap(task, scheduled_task):
+                overlaps = True
+                # If there's an overlap, keep the task with higher priority
+                if PRIORITY_VALUES.get(task['priority'], 0) > PRIORITY_VALUES.get(scheduled_task['priority'], 0):
+                    optimized_schedule.remove(scheduled_task)
+                    optimized_schedule.append(task)
+                break
+
+        # If no overlap or resolved overlap, add task to schedule
+        if not overlaps:
+            optimized_schedule.append(task)
+
+    # Sort optimized schedule by start time
+    optimized_schedule = sorted(optimized_schedule, key=lambda x: parse_time(x['time_start']))
+
+    return optimized_schedule
+
+# Group tasks by time slot and priority, in chronological order
+def group_tasks(tasks):
+    task_groups = {}
+    for task in tasks:
+        key = (task['priority'], task['time_start'], task['time_finish'])
+        if key not in task_groups:
+            task_groups[key] = []
+        task_groups[key].append(task)
+
+    # Sort groups by time for early pruning
+    sorted_keys = sorted(task_groups.keys(), key=lambda k: parse_time(k[1]))
+    return [task_groups[k] for k in sorted_keys]
+
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise SolveCancelled()
+
+def optimize_route(G, tasks, cancel_event=None, progress=None, improve_time=LOCAL_SEARCH_TIME):
+    """
+    Pick one task per time slot and build the walking route for it.
+    Uses branch and bound for small inputs and the greedy solver otherwise.
+    cancel_event (a threading.Event) aborts the search with SolveCancelled;
+    progress is called with the completed fraction in [0, 1]. improve_time is
+    the local search budget in seconds applied after the greedy solver.
+    Returns (schedule, route, total_distance).
+    """
+    sorted_groups = group_tasks(tasks)
+
+    # For very large problems, limit the search space
+    total_combinations = 1
+    for group in sorted_groups:
+        total_combinations *= len(group)
+
+    if total_combinations > MAX_COMBINATIONS:
+        warnings.warn(f"Large search space ({total_combinations} combinations). Applying heuristics.")
+        return greedy_optimize_route(G, tasks, cancel_event, progress, improve_time)
+
+    # For reasonable sized problems, use optimized branch and bound
+    return branch_and_bound_optimize(G, sorted_groups, cancel_event, progress)
+
+def branch_and_bound_optimize(G, sorted_groups, cancel_event=None, progress=None):
+    """Optimized branch and bound approach for finding best schedule"""
+    min_distance = float('inf')
+    best_schedule = None
+    best_route = None
+
+    # Number of leaves below each depth, used to report progress for pruned branches
+    leaves_below = [1] * (len(sorted_groups) + 1)
+    for i in range(len(sorted_groups) - 1, -1, -1):
+        leaves_below[i] = leaves_below[i + 1] * len(sorted_groups[i])
+    total_leaves = leaves_below[0]
+    explored = 0
+
+    # Travel times between consecutive groups, one batched query per group pair
+    group_times = [None]
+    for previous_group, current_group in zip(sorted_groups, sorted_groups[1:]):
+        sources = list(dict.fromkeys(t['building_name'] for t in previous_group))
+        targets = list(dict.fromkeys(t['building_name'] for t in current_group))
+        times, _ = travel_matrix(G, sources, targets)
+        group_times.append({
+            (source, target): times[i, j]
+            for i, source in enumerate(sources)
+            for j, target in enumerate(targets)
+        })
+
+    # Helper function for recursive branching
+    def branch(current_index, current_schedule, current_location, accumulated_distance):
+        nonlocal min_distance, best_schedule, best_route, explored
+        _check_cancelled(cancel_event)
+
+        # Base case: all groups processed
+        if current_index == len(sorted_groups):
+            # Calculate final route and distance
+            route, total_distance = find_optimal_route(G, current_schedule)
+            if total_distance < min_distance:
+                min_distance = total_distance
+                best_schedule = current_schedule.copy()
+                best_route = route
+            explored += 1
+            if progress:
+                progress(explored / total_leaves)
+            return
+
+        # Process current group
+        current_group = sorted_groups[current_index]
+        travel_times = group_times[current_index]
+
+        # Sort tasks in this group by distance from current_location if available
+        if current_location and current_index > 0:
+            tasks_with_distance = []
+            for task in current_group:
+                task_location = task['building_name']
+                distance = travel_times[(current_location, task_location)]
+                tasks_with_distance.append((task, distance))
+
+            # Sort by distance (best candidates first for branch pruning)
+            sorted_tasks = [t[0] for t in sorted(tasks_with_distance, key=lambda x: x[1])]
+        else:
+            sorted_tasks = current_group
+
+        # Try each task in the sorted group
+        for task in sorted_tasks:
+            # Calculate estimated distance increase
+            new_distance = accumulated_distance
+            if current_location:
+                estimated_distance = travel_times[(current_location, task['building_name'])]
+                new_distance += estimated_distance
+
+                # Early pruning: skip this branch if already worse than best
+                if new_distance >= min_distance:
+                    explored += leaves_below[current_index + 1]
+                    continue
+
+            # Add task to current schedule
+            new_schedule = current_schedule + [task]
+
+            # Recurse to next group
+            branch(current_index + 1, new_schedule, task['building_name'], new_distance)
+
+    # Start branching from the first group with empty schedule
+    branch(0, [], None, 0)
+
+    if best_schedule:
+        return best_schedule, best_route, min_distance
+    return [], [], 0
+
+def greedy_optimize_route(G, tasks, cancel_event=None, progress=None, improve_time=0):
+    """Greedy approach for very large problems, optionally followed by local search"""
+    # Sort all tasks by priority (high to low)
+    sorted_tasks = sorted(tasks,
+                         key=lambda x: (-PRIORITY_VALUES.get(x['priority'], 0),
+                                       parse_time(x['time_start'])))
+
+    schedule = []
+    current_location = None
+    # Same-slot, same-priority alternatives for each chosen task, for the local search
+    alternatives = {}
+
+    time_slots = sorted(set([(t['time_start'], t['time_finish']) for t in sorted_tasks]),
+                        key=lambda x: parse_time(x[0]))
+
+    # Process tasks in time order
+    for slot_index, time_slot in enumerate(time_slots):
+        _check_cancelled(cancel_event)
+
+        # Get all tasks in this time slot
+        slot_tasks = [t for t in sorted_tasks if (t['time_start'], t['time_finish']) == time_slot]
+
+        # If no current location, pick highest priority task
+        if not current_location:
+            task = slot_tasks[0]  # Already sorted by priority
+        else:
+            # Find closest task from current location
+            min_distance = float('inf')
+            task = None
+
+            # Group by priority
+            priority_groups = {}
+            for t in slot_tasks:
+                p = t['priority']
+                if p not in priority_groups:
+                    priority_groups[p] = []
+                priority_groups[p].append(t)
+
+            # Travel times to every task in this slot in one batched query
+            times, _ = travel_matrix(G, [current_location], [t['building_name'] for t in slot_tasks])
+            slot_times = dict(zip((t['building_name'] for t in slot_tasks), times[0]))
+
+            # Start with highest priority
+            for priority in sorted(priority_groups.keys(),
+                                 key=lambda p: -PRIORITY_VALUES.get(p, 0)):
+
+                # Find closest task in this priority group
+                for t in priority_groups[priority]:
+                    distance = slot_times[t['building_name']]
+                    if distance < min_distance:
+                        min_distance = distance
+                        task = t
+
+                # If we found a task in this priority group, don't check lower priorities
+                if task:
+                    break
+
+        # Add selected task to schedule
+        if task:
+            schedule.append(task)
+            current_location = task['building_name']
+            alternatives[id(task)] = [t for t in slot_tasks if t['priority'] == task['priority']]
+
+        if progress:
+            progress((slot_index + 1) / len(time_slots))
+
+    # Apply schedule optimization to handle any remaining time conflicts
+    optimized_schedule = optimize_schedule(schedule)
+
+    if improve_time > 0:
+        candidates = [alternatives[id(task)] for task in optimized_schedule]
+        optimized_schedule = improve_schedule(G, optimized_schedule, candidates, improve_time, cancel_event)
+
+    # Calculate route and distance
+    route, total_distance = find_optimal_route(G, optimized_schedule)
+
+    return optimized_schedule, route, total_distance
+
+# Stand-in distance for unreachable legs so the search steers away from them
+UNREACHABLE_PENALTY = 1e9
+
+def improve_schedule(G, schedule, candidates, time_budget=LOCAL_SEARCH_TIME, cancel_event=None,
+                     max_iterations=100000, seed=0):
+    """
+    Simulated annealing over which task is chosen in each time slot of a greedy
+    schedule. candidates[i] lists the interchangeable tasks for schedule[i]
+    (same time slot and priority). A move relocates one slot to another
+    candidate building; its cost change only involves the two neighbouring
+    legs, read from one precomputed distance matrix, so each move is O(1).
+    Stops after time_budget seconds or max_iterations moves, and raises
+    SolveCancelled if cancel_event is set, like the other solver phases.
+    """
+    movable = [i for i, options in enumerate(candidates) if len(options) > 1]
+    if len(schedule) < 2 or not movable:
+        return schedule
+
+    buildings = list(dict.fromkeys(t['building_name'] for options in candidates for t in options))
+    index = {building: i for i, building in enumerate(buildings)}
+    _, dist = travel_matrix(G, buildings, buildings)
+    dist = np.where(np.isfinite(dist), dist, UNREACHABLE_PENALTY)
+    np.fill_diagonal(dist, 0.0)
+    dist = dist.tolist()
+
+    options = [[index[t['building_name']] for t in slot_options] for slot_options in candidates]
+    choice = [slot_options.index(task) for task, slot_options in zip(schedule, candidates)]
+    current = [options[i][choice[i]] for i in range(len(schedule))]
+    last = len(schedule) - 1
+
+    def leg_cost(i, building):
+        # Cost of the legs into and out of slot i if it visits building
+        cost = 0.0
+        if i > 0:
+            cost += dist[current[i - 1]][building]
+        if i < last:
+            cost += dist[building][current[i + 1]]
+        return cost
+
+    cost = sum(dist[a][b] for a, b in zip(current, current[1:]))
+    best_cost = cost
+    best_choice = choice.copy()
+
+    # Start hot enough to accept an average leg's worth of extra walking
+    temperature_start = max(cost / len(schedule), 1.0)
+    rng = random.Random(seed)
+    start_time = time.perf_counter()
+
+    for iteration in range(max_iterations):
+        if iteration % 256 == 0:
+            _check_cancelled(cancel_event)
+            elapsed = time.perf_counter() - start_time
+            if elapsed >= time_budget:
+                break
+            temperature = temperature_start * (1 - elapsed / time_budget) + 1e-9
+
+        i = rng.choice(movable)
+        new_choice = rng.randrange(len(options[i]) - 1)
+        if new_choice >= choice[i]:
+            new_choice += 1
+        building = options[i][new_choice]
+
+        delta = leg_cost(i, building) - leg_cost(i, current[i])
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            choice[i] = new_choice
+            current[i] = building
+            cost += delta
+            if cost < best_cost - 1e-9:
+                best_cost = cost
+                best_choice = choice.copy()
+
+    return [candidates[i][best_choice[i]] for i in range(len(schedule))]
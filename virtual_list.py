@@ -0,0 +1,176 @@
+import tkinter as tk
+from tkinter import ttk
+import tkinter.font as tkfont
+
+class ListModel:
+    """
+    Ordered items backing a VirtualListView. With a key function, a set of
+    keys gives O(1) duplicate checks and add() refuses repeats. Every change
+    notifies the attached views, which coalesce them into one redraw.
+    """
+
+    def __init__(self, items=(), key=None):
+        self.key = key
+        self._items = []
+        self._keys = set()
+        self._listeners = []
+        self.set(items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __contains__(self, item):
+        if self.key is None:
+            return item in self._items
+        return self.key(item) in self._keys
+
+    def listen(self, callback):
+        self._listeners.append(callback)
+
+    def _changed(self):
+        for callback in self._listeners:
+            callback()
+
+    def _append(self, item):
+        if self.key is not None:
+            key = self.key(item)
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+        self._items.append(item)
+        return True
+
+    def add(self, item):
+        """Append item; returns False (and changes nothing) if its key is already present."""
+        if not self._append(item):
+            return False
+        self._changed()
+        return True
+
+    def extend(self, items):
+        """Append every item not already present, with a single change notification."""
+        added = sum(self._append(item) for item in items)
+        if added:
+            self._changed()
+        return added
+
+    def pop(self, index):
+        item = self._items.pop(index)
+        if self.key is not None:
+            self._keys.discard(self.key(item))
+        self._changed()
+        return item
+
+    def set(self, items):
+        """Replace the contents, dropping duplicates."""
+        self._items = []
+        self._keys = set()
+        for item in items:
+            self._append(item)
+        self._changed()
+
+    def clear(self):
+        self.set(())
+
+class VirtualListView(ttk.Frame):
+    """
+    Scrollable list that draws only the rows in view, straight from a
+    ListModel. format_row(index, item) returns the row text, which may span
+    lines_per_row lines. Model changes, scrolling and resizes schedule one
+    redraw with after_idle(), however many arrive before it runs.
+    curselection() mirrors tk.Listbox.
+    """
+
+    def __init__(self, parent, model, format_row, lines_per_row=1, height=8, width=70,
+                 bg="#ffffff", fg="#333333", select_bg="#4a90e2", select_fg="#ffffff",
+                 font=('Helvetica', 9), **kwargs):
+        super().__init__(parent, **kwargs)
+        self.model = model
+        self.format_row = format_row
+        self.fg = fg
+        self.select_bg = select_bg
+        self.select_fg = select_fg
+        self.font = tkfont.Font(font=font)
+        self.row_height = self.font.metrics('linespace') * lines_per_row + 4
+        self.top = 0  # index of the first visible row
+        self.selected = None
+        self._redraw_pending = False
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0,
+                                height=height * self.font.metrics('linespace'),
+                                width=width * self.font.measure('0'))
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind('<Configure>', lambda event: self.schedule_redraw())
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.canvas.bind('<Button-4>', lambda event: self.scroll(-1))
+        self.canvas.bind('<Button-5>', lambda event: self.scroll(1))
+        model.listen(self._on_model_changed)
+
+    def visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def curselection(self):
+        return () if self.selected is None else (self.selected,)
+
+    def scroll(self, rows):
+        self.scroll_to(self.top + rows)
+
+    def scroll_to(self, row):
+        self.top = max(0, min(row, len(self.model) - self.visible_rows()))
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _on_model_changed(self):
+        # Like tk.Listbox, edits drop the selection rather than let it point at another row
+        self.selected = None
+        self.schedule_redraw()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.model)))
+        elif unit == 'pages':
+            self.scroll(int(amount) * self.visible_rows())
+        else:
+            self.scroll(int(amount))
+
+    def _on_click(self, event):
+        row = self.top + event.y // self.row_height
+        self.selected = row if row < len(self.model) else None
+        self.schedule_redraw()
+
+    def _redraw(self):
+        self._redraw_pending = False
+        count = len(self.model)
+        visible = self.visible_rows()
+        self.top = max(0, min(self.top, count - visible))
+
+        self.canvas.delete('row')
+        width = self.canvas.winfo_width()
+        for row in range(self.top, min(count, self.top + visible + 1)):
+            y = (row - self.top) * self.row_height
+            color = self.fg
+            if row == self.selected:
+                self.canvas.create_rectangle(0, y, width, y + self.row_height, fill=self.select_bg,
+                                             width=0, tags='row')
+                color = self.select_fg
+            self.canvas.create_text(4, y + 2, anchor=tk.NW, text=self.format_row(row, self.model[row]),
+                                    font=self.font, fill=color, tags='row')
+
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + visible) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
@@ -2,9 +2,34 @@ import matplotlib.pyplot as plt
 import contextily as ctx
 import geopandas as gpd
 import pandas as pd
+import numpy as np
 from pyproj import Transformer
-import mplcursors
-import networkx as nx
+from hover import HoverPicker
+from leg_cache import lonlat_to_mercator
+
+def place_labels(xs, ys, offset=20, step=10, min_gap=50):
+    """
+    Offset each label diagonally from its point until no label placed so far
+    lies within min_gap meters of it on both axes. Placed labels are
+    bucketed in a grid of min_gap-sized cells, so each check only looks at the
+    neighbouring cells instead of every previous label.
+    """
+    grid = {}
+    positions = []
+    for x, y in zip(xs, ys):
+        offset_x = offset_y = offset
+        while True:
+            px, py = x + offset_x, y + offset_y
+            cx, cy = int(px // min_gap), int(py // min_gap)
+            if not any(abs(px - qx) < min_gap and abs(py - qy) < min_gap
+                       for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                       for qx, qy in grid.get((cx + dx, cy + dy), ())):
+                break
+            offset_x += step
+            offset_y += step
+        grid.setdefault((cx, cy), []).append((px, py))
+        positions.append((px, py))
+    return positions
 
 def plot_graph(G, csuf_locations, route=None):
     # Create a figure and axis
@@ -46,26 +71,14 @@ def plot_graph(G, csuf_locations, route=None):
     
     # Plot route if provided
     if route:
-        route_points = []
-        route_names = []
-        
-        for building in route:
-            lat, lon = csuf_locations[building]
-            route_points.append((lon, lat))
-            route_names.append(building)
-        
-        route_df = pd.DataFrame({'name': route_names, 'lon': [p[0] for p in route_points], 'lat': [p[1] for p in route_points]})
-        route_gdf = gpd.GeoDataFrame(route_df, geometry=gpd.points_from_xy(route_df['lon'], route_df['lat']), crs="EPSG:4326")
-        route_gdf = route_gdf.to_crs(epsg=3857)
+        route_x, route_y = lonlat_to_mercator([csuf_locations[b][1] for b in route],
+                                              [csuf_locations[b][0] for b in route])
         
         # Plot route points
-        route_gdf.plot(ax=ax, color='red', markersize=8)
+        ax.scatter(route_x, route_y, color='red', s=8)
         
-        # Draw lines connecting route points
-        for i in range(len(route_gdf) - 1):
-            x1, y1 = route_gdf.geometry.iloc[i].x, route_gdf.geometry.iloc[i].y
-            x2, y2 = route_gdf.geometry.iloc[i+1].x, route_gdf.geometry.iloc[i+1].y
-            ax.plot([x1, x2], [y1, y2], 'b-', linewidth=2, alpha=0.7)
+        # Draw the whole route as a single polyline
+        ax.plot(route_x, route_y, 'b-', linewidth=2, alpha=0.7)
     
     # Add building labels for important buildings
     important_buildings = [
@@ -76,28 +89,17 @@ def plot_graph(G, csuf_locations, route=None):
         "College Park Building"
     ]
     
-    # Create a dictionary to store text positions to avoid overlap
-    text_positions = {}
-    
-    for x, y, label in zip(gdf.geometry.x, gdf.geometry.y, gdf['name']):
-        if label in important_buildings:
-            # Calculate offset based on building position
-            offset_x = 20
-            offset_y = 20
-            
-            # Check if this position would overlap with existing text
-            while any(abs(x + offset_x - pos_x) < 50 and abs(y + offset_y - pos_y) < 50 
-                     for pos_x, pos_y in text_positions.values()):
-                offset_x += 10
-                offset_y += 10
-            
-            # Store the position
-            text_positions[label] = (x + offset_x, y + offset_y)
-            
-            # Add the text with a white background for better visibility
-            ax.text(x + offset_x, y + offset_y, label, 
-                   fontsize=9, weight='bold', color='black',
-                   bbox=dict(facecolor='white', alpha=0.7, edgecolor='none', pad=2))
+    # Place labels for important buildings without overlapping each other
+    xs = gdf.geometry.x.to_numpy()
+    ys = gdf.geometry.y.to_numpy()
+    labels = gdf['name'].to_numpy()
+    important = gdf['name'].isin(important_buildings).to_numpy()
+    
+    for (x, y), label in zip(place_labels(xs[important], ys[important]), labels[important]):
+        # Add the text with a white background for better visibility
+        ax.text(x, y, label, 
+               fontsize=9, weight='bold', color='black',
+               bbox=dict(facecolor='white', alpha=0.7, edgecolor='none', pad=2))
     
     # Add map background
     ctx.add_basemap(ax, crs=gdf.crs.to_string(), source=ctx.providers.OpenStreetMap.Mapnik)
@@ -113,25 +115,14 @@ def plot_graph(G, csuf_locations, route=None):
     
     ax.format_coord = format_coord
     
-    # Add hover functionality for all points
-    cursor = mplcursors.cursor(ax.collections[0], hover=True)
-    
-    @cursor.connect("add")
-    def on_add(sel):
-        building_name = gdf.iloc[sel.index]['name']
-        if building_name in important_buildings:
-            sel.annotation.set_text(building_name)
-        sel.annotation.get_bbox_patch().set(fc="yellow", alpha=0.8)
-        else:
-            sel.annotation.set_visible(False)
-    
-    # If there's a route, add hover functionality for route points too
+    # Add hover functionality for important buildings and route points
+    hover_x = [xs[important]]
+    hover_y = [ys[important]]
+    hover_names = list(labels[important])
     if route:
-        cursor2 = mplcursors.cursor(ax.collections[1], hover=True)
-        
-        @cursor2.connect("add")
-        def on_add_route(sel):
-            sel.annotation.set_text(route_gdf.iloc[sel.index]['name'])
-            sel.annotation.get_bbox_patch().set(fc="yellow", alpha=0.8)
+        hover_x.append(route_x)
+        hover_y.append(route_y)
+        hover_names.extend(route)
+    hover = HoverPicker(ax, np.concatenate(hover_x), np.concatenate(hover_y), hover_names)
     
     plt.show()